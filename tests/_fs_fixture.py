@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Linux 下 /dev/shm 是 tmpfs，测试目录放这里可以不碰真实磁盘
+_RAM_DIR = "/dev/shm"
+
+
+def ram_tempdir() -> tempfile.TemporaryDirectory:
+    """优先在内存文件系统上创建临时目录，不可用时退回系统默认位置。"""
+    if os.path.isdir(_RAM_DIR) and os.access(_RAM_DIR, os.W_OK | os.X_OK):
+        return tempfile.TemporaryDirectory(dir=_RAM_DIR)
+    return tempfile.TemporaryDirectory()
+
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+_WRITE_WORKERS = 4
+
+
+def _write_one(item: tuple[Path, bytes | str]) -> None:
+    path, data = item
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        os.write(fd, data if isinstance(data, bytes) else data.encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+def lay_out(root: Path, tree: dict[str, bytes | str]) -> None:
+    """按 {相对路径: 内容} 一次性铺好测试目录，str 内容按 UTF-8 写入。"""
+    # 父目录先串行建好，避免多个线程同时 makedirs 同一祖先目录
+    for d in sorted({(root / rel).parent for rel in tree}):
+        d.mkdir(parents=True, exist_ok=True)
+    items = [(root / rel, data) for rel, data in tree.items()]
+    with ThreadPoolExecutor(max_workers=min(_WRITE_WORKERS, len(items) or 1)) as pool:
+        list(pool.map(_write_one, items))
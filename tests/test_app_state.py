@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import json
 import tempfile
+import threading
 import unittest
 from pathlib import Path
+from unittest import mock
 
+from viewer import app_state
 from viewer.app_state import AppState
 from viewer.errors import GameDataInvalidError
 from viewer.game_registry import GameRegistry
@@ -64,6 +67,47 @@ class AppStateTest(unittest.TestCase):
             self.assertEqual(entry.name, "我的游戏")
             self.assertEqual(entry.cover_image, str(title_img.resolve()))
 
+    def test_register_does_not_hold_lock_while_preparing_resources(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            reg = GameRegistry(root / "games_registry.json")
+            state = AppState(reg)
+
+            exe = root / "g" / "Game.exe"
+            data = root / "g" / "www" / "data"
+            data.mkdir(parents=True)
+            exe.write_text("", encoding="utf-8")
+            (data / "MapInfos.json").write_text("[]", encoding="utf-8")
+
+            lock_free = []
+
+            def probe_lock():
+                acquired = state._lock.acquire(timeout=1)
+                if acquired:
+                    state._lock.release()
+                lock_free.append(acquired)
+
+            def fake_prepare(**kwargs):
+                # 解包期间其他线程（即其他请求）必须能拿到锁
+                probe = threading.Thread(target=probe_lock)
+                probe.start()
+                probe.join()
+                return real_prepare(**kwargs)
+
+            real_prepare = app_state.prepare_resources
+            with mock.patch.object(app_state, "prepare_resources", fake_prepare):
+                state.register_exe(str(exe), make_active=True)
+            self.assertEqual(lock_free, [True])
+
+    def test_read_game_ini_title_decodes_common_encodings(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            ini = root / "Game.ini"
+            for encoding in ("utf-8-sig", "utf-16", "cp932"):
+                ini.write_bytes("[Game]\nTitle=勇者の冒険\n".encode(encoding))
+                self.assertEqual(AppState._read_game_ini_title(root), "勇者の冒険", encoding)
+            self.assertIsNone(AppState._read_game_ini_title(root / "missing"))
+
 
 if __name__ == "__main__":
     unittest.main()
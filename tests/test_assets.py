@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import os
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
+from viewer import assets
 from viewer.assets import AssetResolver
 from viewer.errors import InvalidRequestError
 from viewer.game_registry import GameEntry
@@ -77,6 +80,50 @@ class AssetsTest(unittest.TestCase):
             self.assertEqual(ok["status"], "found")
             self.assertIn("/api/assets/file?rel=", ok["url"])
 
+    def test_resolve_map_background_normalizes_backslashes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            entry = _make_entry(root)
+            bg = root / "www" / "img" / "parallaxes" / "sub" / "Forest.png"
+            bg.parent.mkdir(parents=True, exist_ok=True)
+            bg.write_bytes(b"png")
+
+            found = AssetResolver(entry).resolve_map_background({"parallaxName": "sub\\Forest"}, "mv")
+            self.assertEqual(found["status"], "found")
+            self.assertTrue(found["url"].endswith("rel=img/parallaxes/sub/Forest.png"))
+
+    def test_resolve_rel_asset_sees_files_added_after_a_miss(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            entry = _make_entry(root)
+            pictures = root / "www" / "img" / "pictures"
+            pictures.mkdir(parents=True)
+            (pictures / "A.png").write_bytes(b"a")
+
+            resolver = AssetResolver(entry)
+            self.assertIsNone(resolver.resolve_rel_asset("img/pictures/B.png"))
+            (pictures / "B.png").write_bytes(b"b")
+            found = AssetResolver(entry).resolve_rel_asset("img/pictures/B.png")
+            self.assertIsNotNone(found)
+            self.assertEqual(found.read_bytes(), b"b")
+
+    def test_dir_names_cache_keeps_only_recent_directories(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            dirs = []
+            for name in ("a", "b", "c"):
+                d = Path(tmp) / name
+                d.mkdir()
+                (d / f"{name}.png").write_bytes(b"x")
+                # 目录 mtime 需早于稳定窗口才会进缓存
+                os.utime(d, ns=(0, 0))
+                dirs.append(str(d))
+
+            with mock.patch.object(assets, "_DIR_NAMES_CACHE", assets.OrderedDict()), \
+                    mock.patch.object(assets, "_DIR_NAMES_MAX", 2):
+                for d in dirs:
+                    self.assertIn(Path(d).name + ".png", assets._dir_names(d))
+                self.assertEqual(list(assets._DIR_NAMES_CACHE), dirs[1:])
+
 
 if __name__ == "__main__":
     unittest.main()
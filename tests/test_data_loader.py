@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from viewer import data_loader
+from viewer.data_loader import DataLoader
+
+
+class DataLoaderTest(unittest.TestCase):
+    def test_mv_json_shared_across_loaders_until_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp)
+            mapinfos = data_dir / "MapInfos.json"
+            mapinfos.write_text("[]", encoding="utf-8")
+
+            first = DataLoader(data_dir).load_json("MapInfos.json")
+            second = DataLoader(data_dir).load_json("MapInfos.json")
+            self.assertEqual(first, [])
+            self.assertIs(first, second)
+
+            mapinfos.write_text(json.dumps([None, {"id": 1, "name": "Map001"}]), encoding="utf-8")
+            third = DataLoader(data_dir).load_json("MapInfos.json")
+            self.assertEqual(third[1]["name"], "Map001")
+
+    def test_parsed_cache_is_bounded_by_source_bytes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp)
+            (data_dir / "A.json").write_text(json.dumps(["a" * 40]), encoding="utf-8")
+            (data_dir / "B.json").write_text(json.dumps(["b" * 40]), encoding="utf-8")
+
+            data_loader.clear_parsed_json_cache()
+            with mock.patch.object(data_loader, "_PARSED_CACHE_MAX_BYTES", 60):
+                first_a = DataLoader(data_dir).load_json("A.json")
+                self.assertIs(DataLoader(data_dir).load_json("A.json"), first_a)
+                DataLoader(data_dir).load_json("B.json")
+                # 两个文件合计超出上限，最早的 A 被挤出
+                self.assertIsNot(DataLoader(data_dir).load_json("A.json"), first_a)
+            data_loader.clear_parsed_json_cache()
+
+    def test_missing_or_broken_json_returns_none(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp)
+            (data_dir / "System.json").write_text("{broken", encoding="utf-8")
+            loader = DataLoader(data_dir)
+            self.assertIsNone(loader.load_json("System.json"))
+            self.assertIsNone(loader.load_json("Missing.json"))
+
+    def test_exists_sees_files_added_after_a_miss(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp)
+            (data_dir / "MapInfos.json").write_text("[]", encoding="utf-8")
+            loader = DataLoader(data_dir)
+            self.assertTrue(loader.exists("MapInfos.json"))
+            self.assertFalse(loader.exists("Map001.json"))
+
+            (data_dir / "Map001.json").write_text("{}", encoding="utf-8")
+            # 部分文件系统 mtime 精度较粗，显式推进目录 mtime
+            st = os.stat(data_dir)
+            os.utime(data_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+            self.assertTrue(loader.exists("Map001.json"))
+
+    def test_json_with_utf8_bom_is_parsed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp)
+            (data_dir / "System.json").write_bytes(b"\xef\xbb\xbf" + '{"gameTitle": "测试"}'.encode("utf-8"))
+            self.assertEqual(DataLoader(data_dir).load_json("System.json"), {"gameTitle": "测试"})
+
+    def test_large_json_reloads_from_disk_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp) / "data"
+            cache_dir = Path(tmp) / "cache"
+            data_dir.mkdir()
+            items = [None] + [{"id": i, "name": f"物品{i}", "note": "x" * 64} for i in range(1, 1000)]
+            (data_dir / "Items.json").write_text(json.dumps(items), encoding="utf-8")
+
+            with mock.patch.object(data_loader, "_DISK_CACHE_DIR", cache_dir):
+                first = DataLoader(data_dir).load_json("Items.json")
+                self.assertEqual(len(list(cache_dir.glob("*.pkl"))), 1)
+
+                data_loader.clear_parsed_json_cache()
+                with mock.patch.object(data_loader, "_load_json_file", side_effect=AssertionError("should hit disk cache")):
+                    second = DataLoader(data_dir).load_json("Items.json")
+                self.assertEqual(second, first)
+
+                items[1]["name"] = "改名"
+                (data_dir / "Items.json").write_text(json.dumps(items), encoding="utf-8")
+                third = DataLoader(data_dir).load_json("Items.json")
+                self.assertEqual(third[1]["name"], "改名")
+
+
+if __name__ == "__main__":
+    unittest.main()
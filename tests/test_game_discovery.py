@@ -55,6 +55,20 @@ class GameDiscoveryTest(unittest.TestCase):
             self.assertEqual(result.data_dir, data.resolve())
             self.assertIsNone(result.archive_path)
 
+    def test_detects_vx_by_numbered_map_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            exe = root / "Game.exe"
+            exe.write_text("", encoding="utf-8")
+            data = root / "Data"
+            data.mkdir(parents=True)
+            (data / "MapAB1.rvdata").write_bytes(b"dummy")
+            (data / "Map001.rvdata").write_bytes(b"dummy")
+
+            result = discover_game_from_exe(exe)
+            self.assertEqual(result.engine, "vx")
+            self.assertEqual(result.data_dir, data.resolve())
+
     def test_detects_vxace_by_archive(self):
         with tempfile.TemporaryDirectory() as tmp:
             root = Path(tmp)
@@ -1,77 +1,218 @@
 from __future__ import annotations
 
+import os
+import shutil
 import tempfile
 import unittest
 from pathlib import Path
 
+from viewer.errors import InvalidRequestError
 from viewer.game_registry import GameRegistry
 
+from tests._fs_fixture import ram_tempdir
+
 
 class GameRegistryTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = ram_tempdir()
+        cls.tmp_base = Path(cls._tmp.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
     def test_crud_flow(self):
-        with tempfile.TemporaryDirectory() as tmp:
-            root = Path(tmp)
-            registry_path = root / "games_registry.json"
-
-            game_root = root / "game"
-            exe = game_root / "Game.exe"
-            data = game_root / "www" / "data"
-            data.mkdir(parents=True)
-            exe.write_text("", encoding="utf-8")
-            (data / "MapInfos.json").write_text("[]", encoding="utf-8")
-
-            reg = GameRegistry(registry_path)
-            self.assertTrue(registry_path.exists())
-            self.assertEqual(len(reg.list_games()), 0)
-
-            entry = reg.upsert_game(exe, data)
-            self.assertEqual(entry.name, "Game")
-            self.assertEqual(entry.engine, "mv")
-            self.assertEqual(reg.get_active_game_id(), entry.id)
-
-            changed = reg.update_game(entry.id, name="My Game", cover_image="http://example.com/c.png")
-            self.assertEqual(changed.name, "My Game")
-            self.assertEqual(changed.cover_image, "http://example.com/c.png")
-
-            payload = reg.as_payload()
-            self.assertEqual(payload["active_game_id"], entry.id)
-            self.assertEqual(len(payload["games"]), 1)
-            self.assertEqual(payload["games"][0]["engine"], "mv")
-
-            reg.delete_game(entry.id)
-            self.assertEqual(len(reg.list_games()), 0)
-            self.assertEqual(reg.get_active_game_id(), "")
+        root = Path(tempfile.mkdtemp(dir=self.tmp_base))
+        registry_path = root / "games_registry.json"
+
+        game_root = root / "game"
+        exe = game_root / "Game.exe"
+        data = game_root / "www" / "data"
+        data.mkdir(parents=True)
+        exe.write_text("", encoding="utf-8")
+        (data / "MapInfos.json").write_text("[]", encoding="utf-8")
+
+        reg = GameRegistry(registry_path, persist=False)
+        self.assertEqual(len(reg.list_games()), 0)
+
+        entry = reg.upsert_game(exe, data)
+        self.assertEqual(entry.name, "Game")
+        self.assertEqual(entry.engine, "mv")
+        self.assertEqual(reg.get_active_game_id(), entry.id)
+
+        changed = reg.update_game(entry.id, name="My Game", cover_image="http://example.com/c.png")
+        self.assertEqual(changed.name, "My Game")
+        self.assertEqual(changed.cover_image, "http://example.com/c.png")
+
+        payload = reg.as_payload()
+        self.assertEqual(payload["active_game_id"], entry.id)
+        self.assertEqual(len(payload["games"]), 1)
+        self.assertEqual(payload["games"][0]["engine"], "mv")
+
+        reg.delete_game(entry.id)
+        self.assertEqual(len(reg.list_games()), 0)
+        self.assertEqual(reg.get_active_game_id(), "")
+        self.assertFalse(registry_path.exists())
 
     def test_rebuild_when_json_broken(self):
-        with tempfile.TemporaryDirectory() as tmp:
-            root = Path(tmp)
-            registry_path = root / "games_registry.json"
-            registry_path.write_text("{broken json", encoding="utf-8")
-
-            reg = GameRegistry(registry_path)
-            payload = reg.as_payload()
-            self.assertEqual(payload["games"], [])
-            self.assertTrue(payload["warning"])
-            backups = list(root.glob("games_registry.broken.*.json"))
-            self.assertTrue(backups)
+        root = Path(tempfile.mkdtemp(dir=self.tmp_base))
+        registry_path = root / "games_registry.json"
+        registry_path.write_text("{broken json", encoding="utf-8")
+
+        reg = GameRegistry(registry_path)
+        payload = reg.as_payload()
+        self.assertEqual(payload["games"], [])
+        self.assertTrue(payload["warning"])
+        backups = [
+            e.name
+            for e in os.scandir(root)
+            if e.name.startswith("games_registry.broken.") and e.name.endswith(".json")
+        ]
+        self.assertTrue(backups)
 
     def test_engine_persisted(self):
-        with tempfile.TemporaryDirectory() as tmp:
-            root = Path(tmp)
-            registry_path = root / "games_registry.json"
-            data = root / "Data"
-            data.mkdir(parents=True)
-            exe = root / "Game.exe"
-            exe.write_text("", encoding="utf-8")
-            (data / "MapInfos.rvdata2").write_text("x", encoding="utf-8")
-
-            reg = GameRegistry(registry_path)
-            entry = reg.upsert_game(exe, data, engine="vxace")
-            self.assertEqual(entry.engine, "vxace")
-
-            reg2 = GameRegistry(registry_path)
-            loaded = reg2.get_game(entry.id)
-            self.assertEqual(loaded.engine, "vxace")
+        root = Path(tempfile.mkdtemp(dir=self.tmp_base))
+        registry_path = root / "games_registry.json"
+        data = root / "Data"
+        data.mkdir(parents=True)
+        exe = root / "Game.exe"
+        exe.write_text("", encoding="utf-8")
+        (data / "MapInfos.rvdata2").write_text("x", encoding="utf-8")
+
+        reg = GameRegistry(registry_path)
+        self.assertTrue(registry_path.exists())
+        entry = reg.upsert_game(exe, data, engine="vxace")
+        self.assertEqual(entry.engine, "vxace")
+
+        reg2 = GameRegistry(registry_path)
+        loaded = reg2.get_game(entry.id)
+        self.assertEqual(loaded.engine, "vxace")
+
+    def test_batched_mutations_write_once_on_exit(self):
+        root = Path(tempfile.mkdtemp(dir=self.tmp_base))
+        registry_path = root / "games_registry.json"
+        reg = GameRegistry(registry_path)
+        before = registry_path.read_bytes()
+
+        with reg:
+            entry = reg.upsert_game(root / "a" / "Game.exe", root / "a" / "www" / "data")
+            reg.update_game(entry.id, name="Batched")
+            self.assertEqual(registry_path.read_bytes(), before)
+
+        self.assertEqual(GameRegistry(registry_path).get_game(entry.id).name, "Batched")
+
+    def test_small_edits_append_to_log_and_replay_on_load(self):
+        root = Path(tempfile.mkdtemp(dir=self.tmp_base))
+        registry_path = root / "games_registry.json"
+        log_path = root / "games_registry.log.jsonl"
+        reg = GameRegistry(registry_path)
+        first = reg.upsert_game(root / "a" / "Game.exe", root / "a" / "www" / "data")
+        second = reg.upsert_game(root / "b" / "Game.exe", root / "b" / "www" / "data")
+        snapshot = registry_path.read_bytes()
+
+        reg.update_game(first.id, name="Renamed")
+        reg.set_active_game(second.id)
+        reg.delete_game(first.id)
+        self.assertEqual(registry_path.read_bytes(), snapshot)
+        self.assertTrue(log_path.exists())
+
+        reloaded = GameRegistry(registry_path)
+        self.assertEqual([g.id for g in reloaded.list_games()], [second.id])
+        self.assertEqual(reloaded.get_active_game_id(), second.id)
+        # 加载时已把日志并回快照
+        self.assertFalse(log_path.exists())
+
+    def test_rejected_edit_is_not_logged(self):
+        root = Path(tempfile.mkdtemp(dir=self.tmp_base))
+        registry_path = root / "games_registry.json"
+        reg = GameRegistry(registry_path)
+        entry = reg.upsert_game(root / "a" / "Game.exe", root / "a" / "www" / "data")
+
+        with self.assertRaises(InvalidRequestError):
+            reg.update_game(entry.id, name="   ")
+        self.assertFalse((root / "games_registry.log.jsonl").exists())
+        self.assertEqual(GameRegistry(registry_path).get_game(entry.id).name, "Game")
+
+    def test_log_survives_copying_the_registry_folder(self):
+        root = Path(tempfile.mkdtemp(dir=self.tmp_base))
+        src = root / "src"
+        reg = GameRegistry(src / "games_registry.json")
+        entry = reg.upsert_game(root / "a" / "Game.exe", root / "a" / "www" / "data")
+        reg.update_game(entry.id, name="Renamed")
+        reg.delete_game(reg.upsert_game(root / "b" / "Game.exe", root / "b" / "www" / "data").id)
+        reg.update_game(entry.id, cover_image="cover.png")
+
+        # copyfile 不保留 mtime，模拟拷贝/同步整个目录
+        dst = root / "dst"
+        shutil.copytree(src, dst, copy_function=shutil.copyfile)
+        os.utime(dst / "games_registry.json", ns=(0, 0))
+
+        reloaded = GameRegistry(dst / "games_registry.json")
+        self.assertEqual(reloaded.get_game(entry.id).name, "Renamed")
+        self.assertEqual(reloaded.get_game(entry.id).cover_image, "cover.png")
+        self.assertEqual(reloaded.last_warning, "")
+
+    def test_restored_older_snapshot_warns_about_discarded_log(self):
+        root = Path(tempfile.mkdtemp(dir=self.tmp_base))
+        registry_path = root / "games_registry.json"
+        reg = GameRegistry(registry_path)
+        entry = reg.upsert_game(root / "a" / "Game.exe", root / "a" / "www" / "data")
+        backup = registry_path.read_bytes()
+        reg.upsert_game(root / "b" / "Game.exe", root / "b" / "www" / "data")
+        reg.update_game(entry.id, name="After backup")
+
+        registry_path.write_bytes(backup)
+        reloaded = GameRegistry(registry_path)
+        self.assertEqual(reloaded.get_game(entry.id).name, "Game")
+        self.assertIn("1 条修改", reloaded.last_warning)
+
+    def test_stale_log_is_ignored(self):
+        root = Path(tempfile.mkdtemp(dir=self.tmp_base))
+        registry_path = root / "games_registry.json"
+        reg = GameRegistry(registry_path)
+        entry = reg.upsert_game(root / "a" / "Game.exe", root / "a" / "www" / "data")
+        reg.update_game(entry.id, name="From log")
+        stale_log = (root / "games_registry.log.jsonl").read_bytes()
+        reg.upsert_game(root / "a" / "Game.exe", root / "a" / "www" / "data", name="From snapshot")
+
+        (root / "games_registry.log.jsonl").write_bytes(stale_log)
+        self.assertEqual(GameRegistry(registry_path).get_game(entry.id).name, "From snapshot")
+
+    def test_saved_compact_and_exported_indented(self):
+        root = Path(tempfile.mkdtemp(dir=self.tmp_base))
+        registry_path = root / "games_registry.json"
+        reg = GameRegistry(registry_path)
+        entry = reg.upsert_game(root / "a" / "Game.exe", root / "a" / "www" / "data")
+        self.assertNotIn(b"\n", registry_path.read_bytes())
+
+        export_path = root / "backup.json"
+        reg.export(export_path)
+        self.assertIn(b"\n  ", export_path.read_bytes())
+        self.assertEqual(GameRegistry(export_path, persist=False).get_game(entry.id).exe_path, entry.exe_path)
+
+    def test_clean_file_is_not_rewritten_on_load(self):
+        root = Path(tempfile.mkdtemp(dir=self.tmp_base))
+        registry_path = root / "games_registry.json"
+        GameRegistry(registry_path).upsert_game(root / "a" / "Game.exe", root / "a" / "www" / "data")
+        os.utime(registry_path, ns=(0, 0))
+
+        GameRegistry(registry_path)
+        self.assertEqual(registry_path.stat().st_mtime_ns, 0)
+
+    def test_find_by_exe_or_data(self):
+        root = Path(tempfile.mkdtemp(dir=self.tmp_base))
+        reg = GameRegistry(root / "games_registry.json", persist=False)
+        entry = reg.upsert_game(root / "a" / "Game.exe", root / "a" / "www" / "data")
+
+        exe = str((root / "a" / "Game.exe").resolve())
+        data = str((root / "a" / "www" / "data").resolve())
+        self.assertEqual(reg.find_by_exe_or_data(exe, "").id, entry.id)
+        self.assertEqual(reg.find_by_exe_or_data("", data).id, entry.id)
+        self.assertIsNone(reg.find_by_exe_or_data("x", "y"))
+
+        reg.delete_game(entry.id)
+        self.assertIsNone(reg.find_by_exe_or_data(exe, data))
 
 
 if __name__ == "__main__":
@@ -6,6 +6,9 @@ from viewer.interpreter import EventInterpreter
 
 
 class _DummyDb:
+    def get_common_event_name(self, ce_id):
+        return f"CE{ce_id}"
+
     def get_switch_name(self, _sid):
         return ""
 
@@ -55,6 +58,40 @@ class InterpreterVisualTest(unittest.TestCase):
         self.assertEqual(visual["faceName"], "FaceA")
         self.assertEqual(visual["faceIndex"], 1)
 
+    def test_interpret_event_caches_pages_within_map_context(self):
+        interpreter = EventInterpreter(_DummyDb())
+        evt = {
+            "id": 3,
+            "name": "E3",
+            "pages": [{"trigger": 0, "conditions": {}, "image": {}, "list": []}],
+        }
+        interpreter.set_map_context(1, "Map001", {})
+        first = interpreter.interpret_event(evt)
+        second = interpreter.interpret_event(evt)
+        interpreter.clear_map_context()
+        self.assertIs(first["pages"][0], second["pages"][0])
+
+        outside = interpreter.interpret_event(evt)
+        self.assertIsNot(outside["pages"][0], first["pages"][0])
+
+    def test_reparsed_map_page_is_not_served_from_cache(self):
+        interpreter = EventInterpreter(_DummyDb())
+        page = {"trigger": 0, "conditions": {}, "image": {}, "list": []}
+        interpreter.set_map_context(1, "Map001", {})
+        before = interpreter.interpret_event({"id": 3, "name": "E3", "pages": [page]})
+        # 地图文件改动后重新解析得到的是新的页对象
+        edited = {**page, "trigger": 3}
+        after = interpreter.interpret_event({"id": 3, "name": "E3", "pages": [edited]})
+        interpreter.clear_map_context()
+        self.assertEqual(before["pages"][0]["trigger"], "确定键")
+        self.assertEqual(after["pages"][0]["trigger"], "自动执行")
+
+    def test_common_event_command_carries_ce_id(self):
+        interpreter = EventInterpreter(_DummyDb())
+        lines = interpreter._interpret_commands([{"code": 117, "parameters": [12], "indent": 0}])
+        self.assertEqual(lines[0]["cls"], "cmd-common-event")
+        self.assertEqual(lines[0]["ceId"], 12)
+
 
 if __name__ == "__main__":
     unittest.main()
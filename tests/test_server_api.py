@@ -1,61 +1,80 @@
 from __future__ import annotations
 
+import http.client
 import json
 import tempfile
 import threading
 import unittest
 from pathlib import Path
-from urllib import error, request
 
 from viewer.app_state import AppState
 from viewer.game_registry import GameRegistry
 from viewer.server import make_server
 
+from tests._fs_fixture import lay_out, ram_tempdir
+
 
 class ServerApiTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = ram_tempdir()
+        cls.tmp_base = Path(cls._tmp.name)
+        state = AppState(GameRegistry(cls.tmp_base / "games_registry.json", persist=False))
+        cls.server = make_server(state, host="127.0.0.1", port=0)
+        cls.conn = http.client.HTTPConnection("127.0.0.1", cls.server.server_address[1], timeout=10)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.conn.close()
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join(timeout=3)
+        cls._tmp.cleanup()
+
     def setUp(self):
-        self.tmp = tempfile.TemporaryDirectory()
-        self.root = Path(self.tmp.name)
-        self.registry = GameRegistry(self.root / "games_registry.json")
+        # 共享同一个服务器，每个用例换一份全新的注册表与状态
+        self.root = Path(tempfile.mkdtemp(dir=self.tmp_base))
+        self.registry = GameRegistry(self.root / "games_registry.json", persist=False)
         self.state = AppState(self.registry)
-        self.server = make_server(self.state, host="127.0.0.1", port=0)
-        self.port = self.server.server_address[1]
-        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
-        self.thread.start()
-
-    def tearDown(self):
-        self.server.shutdown()
-        self.server.server_close()
-        self.thread.join(timeout=3)
-        self.tmp.cleanup()
+        self.server.app_state = self.state
 
-    def _url(self, path: str) -> str:
-        return f"http://127.0.0.1:{self.port}{path}"
+    def _request(self, method: str, path: str, body: bytes | None = None, headers: dict | None = None):
+        self.conn.request(method, path, body=body, headers=headers or {})
+        resp = self.conn.getresponse()
+        return resp.status, resp.read(), dict(resp.getheaders())
 
     def _get_json(self, path: str):
-        with request.urlopen(self._url(path)) as resp:
-            return resp.getcode(), json.loads(resp.read().decode("utf-8"))
+        code, body, _ = self._request("GET", path)
+        return code, json.loads(body)
 
     def _post_json(self, path: str, payload: dict):
         data = json.dumps(payload).encode("utf-8")
-        req = request.Request(
-            self._url(path),
-            data=data,
-            method="POST",
-            headers={"Content-Type": "application/json"},
-        )
-        with request.urlopen(req) as resp:
-            return resp.getcode(), json.loads(resp.read().decode("utf-8"))
+        code, body, _ = self._request("POST", path, body=data, headers={"Content-Type": "application/json"})
+        return code, json.loads(body)
 
     def _get_bytes(self, path: str):
-        with request.urlopen(self._url(path)) as resp:
-            return resp.getcode(), resp.read(), dict(resp.headers.items())
+        return self._request("GET", path)
+
+    def test_keeps_connection_alive_and_closes_after_error(self):
+        self._get_json("/api/games")
+        sock = self.conn.sock
+        self.assertIsNotNone(sock)
+        self._get_json("/api/games")
+        self.assertIs(self.conn.sock, sock)
+
+        code, _, headers = self._request("GET", "/api/tree")
+        self.assertEqual(code, 400)
+        self.assertEqual(headers.get("Connection"), "close")
+        # http.client 看到 Connection: close 后会丢弃套接字，下个请求自动重连
+        self.assertIsNone(self.conn.sock)
+        code, _ = self._get_json("/api/games")
+        self.assertEqual(code, 200)
 
     def test_tree_requires_active_game(self):
-        with self.assertRaises(error.HTTPError) as ctx:
-            self._get_json("/api/tree")
-        self.assertEqual(ctx.exception.code, 400)
-        payload = json.loads(ctx.exception.read().decode("utf-8"))
+        code, payload = self._get_json("/api/tree")
+        self.assertEqual(code, 400)
         self.assertIn("error", payload)
 
     def test_select_and_tree(self):
@@ -102,32 +121,24 @@ class ServerApiTest(unittest.TestCase):
     def test_map_background_and_assets_meta(self):
         game_root = self.root / "game3"
         exe = game_root / "Game.exe"
-        data = game_root / "www" / "data"
-        bg = game_root / "www" / "img" / "parallaxes" / "Forest.png"
-        iconset = game_root / "www" / "img" / "system" / "IconSet.png"
-        data.mkdir(parents=True)
-        bg.parent.mkdir(parents=True)
-        iconset.parent.mkdir(parents=True)
-        exe.write_text("", encoding="utf-8")
-        bg.write_bytes(b"bg")
-        iconset.write_bytes(b"icon")
-
-        (data / "MapInfos.json").write_text(
-            json.dumps([None, {"id": 1, "name": "Map001", "parentId": 0, "order": 1}]),
-            encoding="utf-8",
-        )
-        (data / "Map001.json").write_text(
-            json.dumps(
-                {
-                    "width": 10,
-                    "height": 10,
-                    "bgm": {"name": "BgmA"},
-                    "parallaxName": "Forest",
-                    "events": [],
-                    "data": [],
-                }
-            ),
-            encoding="utf-8",
+        lay_out(
+            game_root,
+            {
+                "Game.exe": b"",
+                "www/img/parallaxes/Forest.png": b"bg",
+                "www/img/system/IconSet.png": b"icon",
+                "www/data/MapInfos.json": json.dumps([None, {"id": 1, "name": "Map001", "parentId": 0, "order": 1}]),
+                "www/data/Map001.json": json.dumps(
+                    {
+                        "width": 10,
+                        "height": 10,
+                        "bgm": {"name": "BgmA"},
+                        "parallaxName": "Forest",
+                        "events": [],
+                        "data": [],
+                    }
+                ),
+            },
         )
 
         self.state.register_exe(str(exe), make_active=True)
@@ -7,27 +7,28 @@ from pathlib import Path
 
 from viewer.data_loader import DataLoader
 
+from tests._fs_fixture import ram_tempdir
+
+
+_U32 = struct.Struct("<I")
+_U32x4 = struct.Struct("<IIII")
+
 
 def _u32(v: int) -> int:
     return v & 0xFFFFFFFF
 
 
 def _crypt_payload(raw: bytes, data_key: int) -> bytes:
-    data = bytearray(raw)
-    groups = len(data) // 4
+    # 小端密钥流一次性生成，再用一次大整数异或完成解密
+    groups = len(raw) // 4
+    keys = []
     key = data_key
-    for i in range(groups):
-        base = i * 4
-        data[base] ^= (key >> 0) & 0xFF
-        data[base + 1] ^= (key >> 8) & 0xFF
-        data[base + 2] ^= (key >> 16) & 0xFF
-        data[base + 3] ^= (key >> 24) & 0xFF
+    for _ in range(groups):
+        keys.append(key)
         key = _u32(key * 7 + 3)
-    pos = groups * 4
-    while pos < len(data):
-        data[pos] ^= (key >> (8 * (pos % 4))) & 0xFF
-        pos += 1
-    return bytes(data)
+    stream = struct.pack(f"<{groups}I", *keys) + _U32.pack(key)[: len(raw) - groups * 4]
+    mixed = int.from_bytes(raw, "little") ^ int.from_bytes(stream, "little")
+    return mixed.to_bytes(len(raw), "little")
 
 
 def _build_rgss3a_single_entry(path: Path, *, name: str, payload: bytes) -> None:
@@ -37,41 +38,50 @@ def _build_rgss3a_single_entry(path: Path, *, name: str, payload: bytes) -> None
 
     enc_payload = _crypt_payload(payload, data_key)
     name_bytes = name.encode("utf-8")
-    key_bytes = struct.pack("<I", magic)
-    name_enc = bytes(b ^ key_bytes[i % 4] for i, b in enumerate(name_bytes))
+    # 文件名按 4 字节循环异或 magic，拼成整串后一次大整数异或
+    n = len(name_bytes)
+    key_stream = (_U32.pack(magic) * (n // 4 + 1))[:n]
+    name_enc = (int.from_bytes(name_bytes, "little") ^ int.from_bytes(key_stream, "little")).to_bytes(n, "little")
 
-    header = b"RGSSAD" + b"\x00" + b"\x03" + struct.pack("<I", key0)
+    header = b"RGSSAD\x00\x03" + _U32.pack(key0)
     entry_size = 16 + len(name_enc)
     offset = len(header) + entry_size + 16
-    index = struct.pack(
-        "<IIII",
+    entry = _U32x4.pack(
         offset ^ magic,
         len(enc_payload) ^ magic,
         data_key ^ magic,
         len(name_enc) ^ magic,
-    ) + name_enc
-    terminator = struct.pack("<IIII", magic, 0, 0, 0)
-    path.write_bytes(header + index + terminator + enc_payload)
+    )
+    terminator = _U32x4.pack(magic, 0, 0, 0)
+    path.write_bytes(b"".join((header, entry, name_enc, terminator, enc_payload)))
 
 
 class VxArchiveLoaderTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = ram_tempdir()
+        cls.tmp_base = Path(cls._tmp.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
     def test_can_load_mapinfos_from_rgss3a(self):
-        with tempfile.TemporaryDirectory() as tmp:
-            root = Path(tmp)
-            data_dir = root / "Data"
-            data_dir.mkdir(parents=True)
-            archive = root / "Game.rgss3a"
-
-            # Ruby Marshal for an empty array: [].
-            _build_rgss3a_single_entry(
-                archive,
-                name="Data\\MapInfos.rvdata2",
-                payload=b"\x04\x08[\x00",
-            )
-
-            loader = DataLoader(data_dir, engine="vxace", archive_path=archive)
-            self.assertTrue(loader.exists("MapInfos.json"))
-            self.assertEqual(loader.load_json("MapInfos.json"), [])
+        root = Path(tempfile.mkdtemp(dir=self.tmp_base))
+        data_dir = root / "Data"
+        data_dir.mkdir(parents=True)
+        archive = root / "Game.rgss3a"
+
+        # Ruby Marshal for an empty array: [].
+        _build_rgss3a_single_entry(
+            archive,
+            name="Data\\MapInfos.rvdata2",
+            payload=b"\x04\x08[\x00",
+        )
+
+        loader = DataLoader(data_dir, engine="vxace", archive_path=archive)
+        self.assertTrue(loader.exists("MapInfos.json"))
+        self.assertEqual(loader.load_json("MapInfos.json"), [])
 
 
 if __name__ == "__main__":
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-import configparser
+import os
+import re
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-from .data_loader import DataLoader
+from .data_loader import DataLoader, clear_parsed_json_cache
 from .database import DatabaseManager
 from .errors import GameDataInvalidError, NoActiveGameError
 from .exporter import ExportService
@@ -18,8 +20,12 @@ from .java_mv_decrypter import find_java_decrypter_jar, run_java_decrypt
 from .mv_mz_resource_unpack import PrepareResult, prepare_resources
 from .paths import PROJECT_ROOT
 
+# Game.ini 结构很简单，只需要 [Game] 段里的 Title，不必动用 configparser
+_INI_SECTION_RE = re.compile(r"^\s*\[([^\]]*)\]\s*$")
+_INI_KEY_RE = re.compile(r"^\s*([^=:;#\s][^=:]*?)\s*[=:]\s*(.*?)\s*$")
 
-@dataclass
+
+@dataclass(slots=True)
 class ActiveContext:
     game: GameEntry
     loader: DataLoader
@@ -35,6 +41,9 @@ class AppState:
         self.registry = registry
         self._context: ActiveContext | None = None
         self.last_prepare_result: dict[str, Any] | None = None
+        self._lock = threading.RLock()
+        # 注册流程里已经建好的 DataLoader，随后构建上下文时直接复用（避免重复解析归档/System）
+        self._pending_loader: DataLoader | None = None
         self._sync_active_context()
 
     @staticmethod
@@ -45,60 +54,79 @@ class AppState:
     @staticmethod
     def _read_game_ini_title(game_root: Path) -> str | None:
         ini_path = game_root / "Game.ini"
-        if not ini_path.exists() or not ini_path.is_file():
+        try:
+            data = ini_path.read_bytes()
+        except OSError:
             return None
 
+        # 只读一次文件，按 BOM 判定后在内存里依次尝试解码
+        # （utf-8-sig 兼容无 BOM 的 UTF-8；shift_jis 是 cp932 的子集；latin1 兜底必定成功）
+        if data.startswith((b"\xff\xfe", b"\xfe\xff")):
+            encodings: tuple[str, ...] = ("utf-16",)
+        else:
+            encodings = ("utf-8-sig", "cp932", "gbk", "latin1")
         raw = None
-        for enc in ("utf-8-sig", "utf-8", "cp932", "shift_jis", "gbk", "latin1"):
+        for enc in encodings:
             try:
-                raw = ini_path.read_text(encoding=enc)
+                raw = data.decode(enc)
                 break
-            except Exception:  # noqa: BLE001
+            except UnicodeDecodeError:
                 continue
         if raw is None:
             return None
 
-        parser = configparser.ConfigParser()
+        section = None
+        for line in raw.splitlines():
+            m = _INI_SECTION_RE.match(line)
+            if m:
+                section = m.group(1).strip()
+                continue
+            if section != "Game":
+                continue
+            m = _INI_KEY_RE.match(line)
+            if m and m.group(1).lower() == "title":
+                return m.group(2) or None
+        return None
+
+    @staticmethod
+    def _find_first_image(directory: Path) -> Path | None:
         try:
-            parser.read_string(raw)
-        except Exception:  # noqa: BLE001
+            with os.scandir(directory) as it:
+                names = [
+                    entry.name
+                    for entry in it
+                    if entry.name.lower().endswith((".png", ".jpg", ".jpeg", ".webp")) and entry.is_file()
+                ]
+        except OSError:
             return None
-
-        title = parser.get("Game", "Title", fallback="").strip()
-        return title or None
+        if not names:
+            return None
+        return directory / min(names, key=lambda name: (os.path.normcase(name), name))
 
     @staticmethod
-    def _find_first_image(directory: Path) -> Path | None:
-        if not directory.exists() or not directory.is_dir():
+    def _load_system_data(loader: DataLoader | None) -> dict[str, Any] | None:
+        if loader is None:
             return None
-        files = sorted(
-            [p for p in directory.iterdir() if p.is_file() and p.suffix.lower() in (".png", ".jpg", ".jpeg", ".webp")]
-        )
-        if not files:
+        try:
+            system = loader.load_json("System.json")
+        except Exception:  # noqa: BLE001
             return None
-        return files[0]
+        return system if isinstance(system, dict) else None
 
     def _infer_name_from_data(
         self,
         game_root: Path,
-        data_path: Path,
-        engine: str,
-        archive_path: Path | None,
+        system_data: dict[str, Any] | None,
         exe_path: Path,
     ) -> str:
         ini_title = self._read_game_ini_title(game_root)
         if ini_title and not self._is_generic_name(ini_title):
             return ini_title
 
-        try:
-            loader = DataLoader(data_path, engine=engine, archive_path=archive_path)
-            system = loader.load_json("System.json")
-            if isinstance(system, dict):
-                title = str(system.get("gameTitle", "") or "").strip()
-                if title and not self._is_generic_name(title):
-                    return title
-        except Exception:  # noqa: BLE001
-            pass
+        if system_data:
+            title = str(system_data.get("gameTitle", "") or "").strip()
+            if title and not self._is_generic_name(title):
+                return title
 
         stem = exe_path.stem.strip()
         if stem and not self._is_generic_name(stem):
@@ -111,21 +139,15 @@ class AppState:
     def _select_cover_image(
         self,
         game_root: Path,
-        data_path: Path,
+        system_data: dict[str, Any] | None,
         engine: str,
-        archive_path: Path | None,
         prepare_output_dir: str | None,
     ) -> str:
         title1 = ""
         title2 = ""
-        try:
-            loader = DataLoader(data_path, engine=engine, archive_path=archive_path)
-            system = loader.load_json("System.json")
-            if isinstance(system, dict):
-                title1 = str(system.get("title1Name", "") or "").strip()
-                title2 = str(system.get("title2Name", "") or "").strip()
-        except Exception:  # noqa: BLE001
-            pass
+        if system_data:
+            title1 = str(system_data.get("title1Name", "") or "").strip()
+            title2 = str(system_data.get("title2Name", "") or "").strip()
 
         roots: list[Path] = []
         if prepare_output_dir:
@@ -187,7 +209,15 @@ class AppState:
 
     def _build_context(self, game: GameEntry) -> ActiveContext:
         archive_path = self._resolve_archive_path(game)
-        loader = DataLoader(game.data_path, engine=game.engine, archive_path=archive_path)
+        loader = self._pending_loader
+        self._pending_loader = None
+        if (
+            loader is None
+            or loader.engine != game.engine
+            or loader.data_dir != Path(game.data_path).resolve()
+            or (loader.archive.path if loader.archive else None) != (archive_path.resolve() if archive_path else None)
+        ):
+            loader = DataLoader(game.data_path, engine=game.engine, archive_path=archive_path)
         if not loader.exists("MapInfos.json"):
             raise GameDataInvalidError(f"游戏数据无效或缺失地图信息: {game.data_path}")
         db = DatabaseManager(loader)
@@ -201,15 +231,23 @@ class AppState:
             exporter=exporter,
         )
 
+    def _set_context(self, context: ActiveContext | None) -> None:
+        old = self._context
+        self._context = context
+        # 换了游戏（或不再有活动游戏）时，上一个游戏的解析缓存不会再用到，及早释放
+        if old is not None and (context is None or context.loader.data_dir != old.loader.data_dir):
+            clear_parsed_json_cache()
+
     def _sync_active_context(self) -> None:
-        active = self.registry.get_active_game()
-        if not active:
-            self._context = None
-            return
-        try:
-            self._context = self._build_context(active)
-        except GameDataInvalidError:
-            self._context = None
+        with self._lock:
+            active = self.registry.get_active_game()
+            if not active:
+                self._set_context(None)
+                return
+            try:
+                self._set_context(self._build_context(active))
+            except GameDataInvalidError:
+                self._set_context(None)
 
     def refresh(self) -> None:
         self._sync_active_context()
@@ -225,18 +263,28 @@ class AppState:
         return dict(self.last_prepare_result)
 
     def register_exe(self, exe_path: str, name: str | None = None, make_active: bool = False) -> GameEntry:
-        self.last_prepare_result = None
+        # 探测、读 System、资源解包（可能调用 Java 跑上几分钟）都不持锁，
+        # 只在读写注册表和切换上下文时短暂加锁，其他请求不会被导入流程堵住
+        return self._register_exe(exe_path, name=name, make_active=make_active)
+
+    def _register_exe(self, exe_path: str, name: str | None, make_active: bool) -> GameEntry:
+        with self._lock:
+            self.last_prepare_result = None
         discovery = discover_game_from_exe(exe_path)
         exe_resolved = Path(exe_path).expanduser().resolve()
         game_root = exe_resolved.parent
         data_resolved = discovery.data_dir.resolve()
         archive_path = discovery.archive_path.resolve() if discovery.archive_path else None
 
-        existing = None
-        for game in self.registry.list_games():
-            if game.exe_path == str(exe_resolved) or game.data_path == str(data_resolved):
-                existing = game
-                break
+        with self._lock:
+            existing = self.registry.find_by_exe_or_data(str(exe_resolved), str(data_resolved))
+
+        # 名称推断与封面选择共用同一个 DataLoader，System.json 只读一次
+        try:
+            loader = DataLoader(data_resolved, engine=discovery.engine, archive_path=archive_path)
+        except Exception:  # noqa: BLE001
+            loader = None
+        system_data = self._load_system_data(loader)
 
         final_name = (name or "").strip()
         if not final_name:
@@ -245,20 +293,21 @@ class AppState:
             else:
                 final_name = self._infer_name_from_data(
                     game_root=game_root,
-                    data_path=data_resolved,
-                    engine=discovery.engine,
-                    archive_path=archive_path,
+                    system_data=system_data,
                     exe_path=exe_resolved,
                 )
 
-        entry = self.registry.upsert_game(
-            exe_path=exe_path,
-            data_path=discovery.data_dir,
-            name=final_name,
-            engine=discovery.engine,
-        )
+        with self._lock:
+            entry = self.registry.upsert_game(
+                exe_path=exe_resolved,
+                data_path=data_resolved,
+                name=final_name,
+                engine=discovery.engine,
+                resolved=True,
+            )
 
         prepare_output_dir = ""
+        prepare_payload: dict[str, Any] | None = None
 
         if discovery.engine == "mv":
             cache_dir = game_root / "data_cache"
@@ -278,49 +327,65 @@ class AppState:
                     processed_files=0,
                     failed_files=0,
                 )
-            self.last_prepare_result = prepare_result.to_dict()
+            prepare_payload = prepare_result.to_dict()
             prepare_output_dir = prepare_result.output_dir
 
+        cover_image = ""
         if not (entry.cover_image or "").strip():
             cover_image = self._select_cover_image(
                 game_root=game_root,
-                data_path=data_resolved,
+                system_data=system_data,
                 engine=discovery.engine,
-                archive_path=archive_path,
                 prepare_output_dir=prepare_output_dir or None,
             )
-            if cover_image:
-                entry = self.registry.update_game(entry.id, cover_image=cover_image)
 
-        if make_active:
-            self.registry.set_active_game(entry.id)
-        self._sync_active_context()
+        with self._lock:
+            self.last_prepare_result = prepare_payload
+            # 补封面与设为当前游戏合并为一次写盘（登记本身已先落盘，解包中途退出也不会丢）
+            with self.registry:
+                if cover_image:
+                    entry = self.registry.update_game(entry.id, cover_image=cover_image)
+                if make_active:
+                    self.registry.set_active_game(entry.id)
+            self._pending_loader = loader
+            try:
+                self._sync_active_context()
+            finally:
+                self._pending_loader = None
         return entry
 
     def select_game(self, game_id: str) -> ActiveContext:
-        game = self.registry.get_game(game_id)
-        context = self._build_context(game)
-        self.registry.set_active_game(game_id)
-        self._context = context
-        return self._context
+        with self._lock:
+            game = self.registry.get_game(game_id)
+            context = self._build_context(game)
+            self.registry.set_active_game(game_id)
+            self._set_context(context)
+            return self._context
 
     def update_game(self, game_id: str, *, name: str | None = None, cover_image: Any = None, cover_provided: bool = False) -> GameEntry:
-        if cover_provided:
-            entry = self.registry.update_game(game_id, name=name, cover_image=cover_image)
-        else:
-            entry = self.registry.update_game(game_id, name=name)
-        if self.registry.get_active_game_id() == entry.id:
-            self._sync_active_context()
-        return entry
+        with self._lock:
+            if cover_provided:
+                entry = self.registry.update_game(game_id, name=name, cover_image=cover_image)
+            else:
+                entry = self.registry.update_game(game_id, name=name)
+            if self.registry.get_active_game_id() == entry.id:
+                self._sync_active_context()
+            return entry
 
     def delete_game(self, game_id: str) -> None:
-        self.registry.delete_game(game_id)
-        self._sync_active_context()
+        with self._lock:
+            self.registry.delete_game(game_id)
+            self._sync_active_context()
 
     def get_active_context(self) -> ActiveContext:
-        active = self.registry.get_active_game()
-        if not active:
-            raise NoActiveGameError("当前未选择游戏，请先通过 game_tool.bat 或游戏库管理添加并选择游戏")
-        if not self._context or self._context.game.id != active.id:
-            self._context = self._build_context(active)
-        return self._context
+        with self._lock:
+            # 每个请求都会走到这里：活动游戏未变时直接复用上下文，不再反序列化整个游戏列表
+            context = self._context
+            if context is not None and context.game.id == self.registry.get_active_game_id():
+                return context
+            active = self.registry.get_active_game()
+            if not active:
+                raise NoActiveGameError("当前未选择游戏，请先通过 game_tool.bat 或游戏库管理添加并选择游戏")
+            if not self._context or self._context.game.id != active.id:
+                self._set_context(self._build_context(active))
+            return self._context
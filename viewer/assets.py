@@ -2,7 +2,13 @@
 
 from __future__ import annotations
 
-from pathlib import Path, PurePosixPath
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
 from typing import Any
 from urllib.parse import quote
 
@@ -10,6 +16,59 @@ from .errors import InvalidRequestError
 from .game_registry import GameEntry
 
 _IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp", ".bmp")
+_PARENT_SEGMENT_RE = re.compile(r"(?:^|/)\.\.(?:/|$)")
+_MAP_BACKGROUND_BASES = {
+    "mv": ("img/parallaxes",),
+    "other": ("Graphics/Parallaxes", "img/parallaxes"),
+}
+_ENEMY_PORTRAIT_BASES = {
+    "mv": ("img/enemies", "img/sv_enemies"),
+    "other": ("Graphics/Battlers", "img/enemies", "img/sv_enemies"),
+}
+
+# 目录 -> (mtime_ns, 小写文件名集合, 上次校验时刻)。增删文件会改变目录 mtime，据此自动失效。
+# 按最近使用淘汰，最多保留 _DIR_NAMES_MAX 个目录；请求处理线程并发访问，读写都持锁。
+_DIR_NAMES_CACHE: OrderedDict[str, tuple[int, frozenset[str], float]] = OrderedDict()
+_DIR_NAMES_MAX = 512
+_DIR_NAMES_LOCK = threading.Lock()
+# 刚改动过的目录不缓存：mtime 精度较粗的文件系统上，同一时间戳内可能还有新文件写入
+_DIR_NAMES_SETTLE_NS = 2_000_000_000
+# 校验过 mtime 的列表在这段时间内直接信任，一次地图渲染/图鉴请求内的大量查找不再逐个 stat
+_DIR_NAMES_TTL = 1.0
+
+
+def _remember_dir_names(directory: str, entry: tuple[int, frozenset[str], float]) -> None:
+    with _DIR_NAMES_LOCK:
+        _DIR_NAMES_CACHE[directory] = entry
+        _DIR_NAMES_CACHE.move_to_end(directory)
+        if len(_DIR_NAMES_CACHE) > _DIR_NAMES_MAX:
+            _DIR_NAMES_CACHE.popitem(last=False)
+
+
+def _dir_names(directory: str) -> frozenset[str] | None:
+    now = time.monotonic()
+    with _DIR_NAMES_LOCK:
+        cached = _DIR_NAMES_CACHE.get(directory)
+        if cached is not None:
+            _DIR_NAMES_CACHE.move_to_end(directory)
+    if cached is not None and now - cached[2] < _DIR_NAMES_TTL:
+        return cached[1]
+    # stat/scandir 不持锁，其他线程的查找不必等待磁盘
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+    if cached is not None and cached[0] == mtime:
+        _remember_dir_names(directory, (mtime, cached[1], now))
+        return cached[1]
+    try:
+        with os.scandir(directory) as it:
+            names = frozenset(entry.name.lower() for entry in it)
+    except OSError:
+        return None
+    if time.time_ns() - mtime > _DIR_NAMES_SETTLE_NS:
+        _remember_dir_names(directory, (mtime, names, now))
+    return names
 
 
 def _dedupe_paths(paths: list[Path]) -> list[Path]:
@@ -28,6 +87,17 @@ def _normalize_rel(rel: str) -> str:
     return str(rel or "").strip().replace("\\", "/")
 
 
+@lru_cache(maxsize=4096)
+def _image_candidates_for(bases: tuple[str, ...], name: str) -> tuple[str, ...]:
+    # 同一素材名会在导出/图鉴中被反复查找，候选列表只与 (目录组, 名称) 有关
+    nm = str(name or "").strip().replace("\\", "/")
+    if not nm:
+        return ()
+    if Path(nm).suffix:
+        return tuple(f"{base}/{nm}" for base in bases)
+    return tuple(f"{base}/{nm}{ext}" for base in bases for ext in _IMAGE_EXTS)
+
+
 def asset_url_for_rel(rel: str) -> str:
     return f"/api/assets/file?rel={quote(rel)}"
 
@@ -35,10 +105,15 @@ def asset_url_for_rel(rel: str) -> str:
 class AssetResolver:
     """Locate game assets across decrypted cache/www/root directories."""
 
+    __slots__ = ("game", "game_root", "search_roots", "_resolved_roots", "_rel_cache")
+
     def __init__(self, game: GameEntry):
         self.game = game
         self.game_root = Path(game.exe_path).expanduser().resolve().parent
         self.search_roots = self._build_search_roots()
+        self._resolved_roots = [str(root.resolve()) for root in self.search_roots]
+        # 单个解析器只服务一次请求，请求内重复查找同一路径时直接复用结果
+        self._rel_cache: dict[tuple[str, ...], Path | None] = {}
 
     def _build_search_roots(self) -> list[Path]:
         cache_root = self.game_root / "data_cache" / "decrypted"
@@ -52,7 +127,8 @@ class AssetResolver:
         return _dedupe_paths(existing)
 
     @staticmethod
-    def _validate_rel(rel: str) -> PurePosixPath:
+    def _validate_rel(rel: str) -> tuple[str, ...]:
+        """校验相对路径并返回规范化后的路径段（去掉空段和 "."）。"""
         normalized = _normalize_rel(rel)
         if not normalized:
             raise InvalidRequestError("资源相对路径不能为空")
@@ -60,29 +136,39 @@ class AssetResolver:
             raise InvalidRequestError("资源路径必须为相对路径")
         if len(normalized) >= 2 and normalized[1] == ":":
             raise InvalidRequestError("资源路径不允许使用绝对盘符路径")
-        rel_path = PurePosixPath(normalized)
-        if rel_path.is_absolute():
-            raise InvalidRequestError("资源路径必须为相对路径")
-        if any(part == ".." for part in rel_path.parts):
+        if _PARENT_SEGMENT_RE.search(normalized):
             raise InvalidRequestError("资源路径不允许包含上级目录")
-        return rel_path
+        return tuple(part for part in normalized.split("/") if part and part != ".")
 
     def resolve_rel_asset(self, rel: str) -> Path | None:
-        rel_path = self._validate_rel(rel)
-        for root in self.search_roots:
-            candidate = root.joinpath(*rel_path.parts)
-            try:
-                resolved = candidate.resolve()
-                root_resolved = root.resolve()
-            except Exception:  # noqa: BLE001
+        parts = self._validate_rel(rel)
+        if parts in self._rel_cache:
+            return self._rel_cache[parts]
+        found = self._probe_rel_asset(parts) if parts else None
+        self._rel_cache[parts] = found
+        return found
+
+    def _probe_rel_asset(self, parts: tuple[str, ...]) -> Path | None:
+        leaf = parts[-1].lower()
+        for root_resolved in self._resolved_roots:
+            # 先用缓存的目录列表排除不存在的候选，命中后再做完整校验（按小写比较，只会多放行不会漏）
+            names = _dir_names(os.path.join(root_resolved, *parts[:-1]))
+            if names is None or leaf not in names:
+                continue
+            candidate = os.path.join(root_resolved, *parts)
+            if not os.path.isfile(candidate):
                 continue
-            if not str(resolved).startswith(str(root_resolved)):
+            # 只对命中的文件做一次 realpath，防止符号链接逃出搜索根目录
+            real = os.path.realpath(candidate)
+            try:
+                if os.path.normcase(os.path.commonpath((real, root_resolved))) != os.path.normcase(root_resolved):
+                    continue
+            except ValueError:
                 continue
-            if resolved.exists() and resolved.is_file():
-                return resolved
+            return Path(real)
         return None
 
-    def _resolve_first_rel(self, rel_candidates: list[str]) -> str | None:
+    def _resolve_first_rel(self, rel_candidates: list[str] | tuple[str, ...]) -> str | None:
         for rel in rel_candidates:
             normalized = _normalize_rel(rel)
             if not normalized:
@@ -91,17 +177,12 @@ class AssetResolver:
                 return normalized
         return None
 
-    @staticmethod
-    def _build_image_candidates(base: str, name: str) -> list[str]:
-        nm = str(name or "").strip()
-        if not nm:
-            return []
-        if Path(nm).suffix:
-            return [f"{base}/{nm}"]
-        out = []
-        for ext in _IMAGE_EXTS:
-            out.append(f"{base}/{nm}{ext}")
-        return out
+    def _resolve_first_image(self, bases: tuple[str, ...], name: str) -> str | None:
+        # 候选由 _image_candidates_for 生成，已经是规范化的 "/" 路径，不必再走一遍 _normalize_rel
+        for rel in _image_candidates_for(bases, name):
+            if self.resolve_rel_asset(rel):
+                return rel
+        return None
 
     def resolve_map_background(self, map_data: dict[str, Any], engine: str) -> dict[str, str]:
         name = str((map_data or {}).get("parallaxName", "") or "").strip()
@@ -113,15 +194,8 @@ class AssetResolver:
                 "message": "当前地图未配置背景材质",
             }
 
-        if engine == "mv":
-            bases = ["img/parallaxes"]
-        else:
-            bases = ["Graphics/Parallaxes", "img/parallaxes"]
-
-        rel_candidates: list[str] = []
-        for base in bases:
-            rel_candidates.extend(self._build_image_candidates(base, name))
-        rel = self._resolve_first_rel(rel_candidates)
+        bases = _MAP_BACKGROUND_BASES["mv" if engine == "mv" else "other"]
+        rel = self._resolve_first_image(bases, name)
         if rel:
             return {
                 "status": "found",
@@ -167,12 +241,5 @@ class AssetResolver:
         if not name:
             return ""
 
-        if self.game.engine == "mv":
-            bases = ["img/enemies", "img/sv_enemies"]
-        else:
-            bases = ["Graphics/Battlers", "img/enemies", "img/sv_enemies"]
-
-        rel_candidates: list[str] = []
-        for base in bases:
-            rel_candidates.extend(self._build_image_candidates(base, name))
-        return self._resolve_first_rel(rel_candidates) or ""
+        bases = _ENEMY_PORTRAIT_BASES["mv" if self.game.engine == "mv" else "other"]
+        return self._resolve_first_image(bases, name) or ""
@@ -2,28 +2,148 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import pickle
+import struct
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
+try:  # 可选加速：装了 orjson 就用，没有则使用标准库
+    import orjson
+except ImportError:
+    orjson = None
+
 from ._vendor.rubymarshal.reader import loads as marshal_loads
 from .errors import GameDataInvalidError
+from .paths import PARSED_JSON_CACHE_DIR
 from .rgss_archive import RgssArchive
 from .vx_adapter import VXDataAdapter
 
 _SENTINEL = object()
+_MISSING = object()
+
+# 解析结果的磁盘缓存：放在查看器自己的目录下（不写进游戏目录，也不加载游戏目录里的 pickle）。
+# 文件头记录源文件 mtime/size，不匹配即视为过期；小文件直接解析更快，不走磁盘缓存。
+_DISK_CACHE_DIR = PARSED_JSON_CACHE_DIR
+_DISK_CACHE_MIN_SIZE = 64 * 1024
+_DISK_CACHE_HEADER = struct.Struct("<qq")
+
+# 内存中的解析结果缓存：跨 DataLoader 复用（切换上下文会重建加载器），按源文件字节数计容量。
+# 解析后的对象树通常是源文件的数倍大，上限按源文件大小取得保守些；切换/移除游戏时由 AppState 清空。
+_PARSED_CACHE_MAX_BYTES = 32 * 1024 * 1024
+_parsed_cache: OrderedDict[tuple[str, int, int], Any] = OrderedDict()
+_parsed_cache_bytes = 0
+_parsed_cache_lock = threading.Lock()
+
+
+def _load_json_file(path: str) -> Any:
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            # orjson 不接受 BOM/UTF-16 等标准库能处理的输入，交回标准库（真坏文件也由它报错）
+            pass
+    # 标准库没有流式解析器：先解码并立即释放原始字节，解析大文件（Troops/MapXXX）时
+    # 内存里只剩文本和解析结果，峰值少一份文件大小
+    text = data.decode(json.detect_encoding(data), "surrogatepass")
+    del data
+    return json.loads(text)
+
+
+def _disk_cache_file(path: str) -> Path:
+    return _DISK_CACHE_DIR / (hashlib.sha1(path.encode("utf-8")).hexdigest() + ".pkl")
+
+
+def _read_disk_cache(cache_file: Path, mtime_ns: int, size: int) -> Any:
+    try:
+        with open(cache_file, "rb") as f:
+            if _DISK_CACHE_HEADER.unpack(f.read(_DISK_CACHE_HEADER.size)) != (mtime_ns, size):
+                return _SENTINEL
+            return pickle.loads(f.read())
+    except Exception:  # noqa: BLE001
+        return _SENTINEL
+
+
+def _write_disk_cache(cache_file: Path, mtime_ns: int, size: int, value: Any) -> None:
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, "wb") as f:
+            f.write(_DISK_CACHE_HEADER.pack(mtime_ns, size))
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except Exception:  # noqa: BLE001
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
+
+
+def clear_parsed_json_cache() -> None:
+    """丢弃内存中缓存的全部解析结果（磁盘缓存不受影响）。"""
+    global _parsed_cache_bytes
+    with _parsed_cache_lock:
+        _parsed_cache.clear()
+        _parsed_cache_bytes = 0
+
+
+def _parse_json_file(path: str, mtime_ns: int, size: int) -> Any:
+    # mtime/size 也是缓存键的一部分：文件被改写后自动失效。
+    global _parsed_cache_bytes
+    key = (path, mtime_ns, size)
+    with _parsed_cache_lock:
+        value = _parsed_cache.get(key, _MISSING)
+        if value is not _MISSING:
+            _parsed_cache.move_to_end(key)
+            return value
+    value = _parse_json_uncached(path, mtime_ns, size)
+    if size <= _PARSED_CACHE_MAX_BYTES:
+        with _parsed_cache_lock:
+            if key not in _parsed_cache:
+                _parsed_cache[key] = value
+                _parsed_cache_bytes += size
+                while _parsed_cache_bytes > _PARSED_CACHE_MAX_BYTES:
+                    (_, _, old_size), _ = _parsed_cache.popitem(last=False)
+                    _parsed_cache_bytes -= old_size
+    return value
+
+
+def _parse_json_uncached(path: str, mtime_ns: int, size: int) -> Any:
+    use_disk_cache = size >= _DISK_CACHE_MIN_SIZE
+    if use_disk_cache:
+        cache_file = _disk_cache_file(path)
+        value = _read_disk_cache(cache_file, mtime_ns, size)
+        if value is not _SENTINEL:
+            return value
+    # 按字节读入再自行探测编码，带 BOM 的文件也能读
+    value = _load_json_file(path)
+    if use_disk_cache:
+        _write_disk_cache(cache_file, mtime_ns, size, value)
+    return value
 
 
 class DataLoader:
     """Loads game data from MV JSON or VX/VX Ace rvdata files."""
 
+    __slots__ = ("data_dir", "engine", "_cache", "_cache_lock", "archive", "_data_files")
+
     def __init__(self, data_dir: str | Path, engine: str = "mv", archive_path: str | Path | None = None):
         self.data_dir = Path(data_dir).resolve()
         self.engine = (engine or "mv").strip().lower()
         if self.engine not in ("mv", "vx", "vxace"):
             self.engine = "mv"
         self._cache: dict[str, Any] = {}
+        # DatabaseManager 会在线程池里并发调用 load_json；解析本身不持锁，同名文件偶尔重复解析无害
+        self._cache_lock = threading.Lock()
         self.archive: RgssArchive | None = None
+        # (data 目录 mtime, normcase 后的文件名集合)；首次探测时列一次目录
+        self._data_files: tuple[int | None, frozenset[str]] | None = None
 
         if self.engine in ("vx", "vxace") and archive_path:
             archive = Path(archive_path).expanduser().resolve()
@@ -37,13 +157,36 @@ class DataLoader:
 
     def exists(self, filename: str) -> bool:
         if self.engine == "mv":
-            return self.file_path(filename).exists()
+            return self._has_data_file(filename)
         return self._locate_vx_source(filename) is not None
 
+    def _has_data_file(self, filename: str) -> bool:
+        # 命中直接信任（文件之后被删，读取时自然返回 None）；未命中时目录 mtime 变了才重新列目录
+        key = os.path.normcase(filename)
+        cached = self._data_files
+        if cached is not None and key in cached[1]:
+            return True
+        try:
+            mtime = os.stat(self.data_dir).st_mtime_ns
+        except OSError:
+            mtime = None
+        if cached is not None and cached[0] == mtime:
+            return False
+        files: frozenset[str] = frozenset()
+        if mtime is not None:
+            try:
+                with os.scandir(self.data_dir) as it:
+                    files = frozenset(os.path.normcase(entry.name) for entry in it if entry.is_file())
+            except OSError:
+                pass
+        self._data_files = (mtime, files)
+        return key in files
+
     def load_json(self, filename: str) -> Any:
         cache_key = filename.lower()
-        if cache_key in self._cache:
-            value = self._cache[cache_key]
+        with self._cache_lock:
+            value = self._cache.get(cache_key, _MISSING)
+        if value is not _MISSING:
             return None if value is _SENTINEL else value
 
         if self.engine == "mv":
@@ -51,14 +194,15 @@ class DataLoader:
         else:
             value = self._load_vx_data(filename)
 
-        self._cache[cache_key] = _SENTINEL if value is None else value
-        return value
+        with self._cache_lock:
+            value = self._cache.setdefault(cache_key, _SENTINEL if value is None else value)
+        return None if value is _SENTINEL else value
 
     def _load_mv_json(self, filename: str) -> Any:
         filepath = self.file_path(filename)
         try:
-            with filepath.open("r", encoding="utf-8") as f:
-                return json.load(f)
+            st = filepath.stat()
+            return _parse_json_file(str(filepath), st.st_mtime_ns, st.st_size)
         except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError):
             return None
 
@@ -92,9 +236,8 @@ class DataLoader:
 
     def _locate_vx_source(self, filename: str) -> tuple[str, Any] | None:
         for candidate in self._vx_candidates(filename):
-            disk = self.data_dir / candidate
-            if disk.exists() and disk.is_file():
-                return ("disk", disk)
+            if self._has_data_file(candidate):
+                return ("disk", self.data_dir / candidate)
 
         if not self.archive:
             return None
@@ -2,20 +2,69 @@
 
 from __future__ import annotations
 
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from .data_loader import DataLoader
 
+_DATABASE_FILES = (
+    "Items.json",
+    "Weapons.json",
+    "Armors.json",
+    "Enemies.json",
+    "Skills.json",
+    "States.json",
+    "System.json",
+    "MapInfos.json",
+)
+# 次要数据表按需加载：属性名 -> 所属数据文件（同一文件的属性一起构建）
+_LAZY_ATTRS = {
+    "raw_troops": "Troops.json",
+    "troops": "Troops.json",
+    "_troops_by_id": "Troops.json",
+    "common_events": "CommonEvents.json",
+    "common_event_names": "CommonEvents.json",
+    "_common_events_by_id": "CommonEvents.json",
+    "tilesets": "Tilesets.json",
+    "_tilesets_by_id": "Tilesets.json",
+}
+_LOAD_WORKERS = 4
+
 
 def build_name_map(json_data, fallback: str = "未知"):
+    return build_name_and_field_maps(json_data, fallback)[0]
+
+
+def build_name_and_field_maps(json_data, fallback: str = "未知", fields=None):
+    """一次遍历同时构建 id->名称 映射和 fields 中各字段的 id->值 映射（fields: {字段名: 默认值}）。"""
     mapping = {}
+    field_maps = {name: {} for name in (fields or {})}
     if not isinstance(json_data, list):
-        return mapping
+        return mapping, field_maps
+    field_items = list((fields or {}).items())
     for item in json_data:
         if item is not None and isinstance(item, dict):
             item_id = item.get("id")
             item_name = item.get("name", "").strip()
             if item_id is not None:
-                mapping[item_id] = item_name if item_name else f"{fallback}#{item_id}"
-    return mapping
+                # 名称会在解释器里被反复比较/拼接，驻留后重复名称共用同一对象
+                mapping[item_id] = sys.intern(item_name) if item_name else f"{fallback}#{item_id}"
+                for name, default in field_items:
+                    field_maps[name][item_id] = item.get(name, default)
+    return mapping, field_maps
+
+
+def build_id_index(json_data):
+    index = {}
+    if not isinstance(json_data, list):
+        return index
+    for item in json_data:
+        if item and isinstance(item, dict):
+            item_id = item.get("id")
+            if item_id is not None and item_id not in index:
+                index[item_id] = item
+    return index
 
 
 def build_switch_var_map(json_array, fallback_prefix: str = ""):
@@ -26,7 +75,7 @@ def build_switch_var_map(json_array, fallback_prefix: str = ""):
         if idx == 0:
             continue
         if isinstance(name, str) and name.strip():
-            mapping[idx] = name.strip()
+            mapping[idx] = sys.intern(name.strip())
         else:
             mapping[idx] = f"{fallback_prefix}#{idx}"
     return mapping
@@ -38,31 +87,28 @@ class DatabaseManager:
     def __init__(self, loader: DataLoader):
         self.loader = loader
         self.engine = loader.engine
+        self._lazy_lock = threading.Lock()
+
+        # 文件读取与解析相互独立，并行加载以重叠磁盘 I/O。
+        with ThreadPoolExecutor(max_workers=_LOAD_WORKERS) as pool:
+            loaded = dict(zip(_DATABASE_FILES, pool.map(loader.load_json, _DATABASE_FILES)))
 
-        self.raw_items = loader.load_json("Items.json") or []
-        self.raw_weapons = loader.load_json("Weapons.json") or []
-        self.raw_armors = loader.load_json("Armors.json") or []
-        self.raw_enemies = loader.load_json("Enemies.json") or []
-        self.raw_skills = loader.load_json("Skills.json") or []
-        self.raw_states = loader.load_json("States.json") or []
-        self.raw_troops = loader.load_json("Troops.json") or []
-
-        self.item_types = {}
-        for item in self.raw_items:
-            if item is not None and isinstance(item, dict):
-                iid = item.get("id")
-                if iid is not None:
-                    self.item_types[iid] = item.get("itypeId", 1)
-
-        self.items = build_name_map(self.raw_items, "未知物品")
+        self.raw_items = loaded["Items.json"] or []
+        self.raw_weapons = loaded["Weapons.json"] or []
+        self.raw_armors = loaded["Armors.json"] or []
+        self.raw_enemies = loaded["Enemies.json"] or []
+        self.raw_skills = loaded["Skills.json"] or []
+        self.raw_states = loaded["States.json"] or []
+
+        self.items, item_fields = build_name_and_field_maps(self.raw_items, "未知物品", {"itypeId": 1})
+        self.item_types = item_fields["itypeId"]
         self.weapons = build_name_map(self.raw_weapons, "未知武器")
         self.armors = build_name_map(self.raw_armors, "未知防具")
         self.enemies = build_name_map(self.raw_enemies, "未知敌人")
         self.skills = build_name_map(self.raw_skills, "技能")
         self.states = build_name_map(self.raw_states, "状态")
-        self.troops = build_name_map(self.raw_troops, "敌群")
 
-        system_data = loader.load_json("System.json")
+        system_data = loaded["System.json"]
         if system_data:
             self.switches = build_switch_var_map(system_data.get("switches", []), "开关")
             self.variables = build_switch_var_map(system_data.get("variables", []), "变量")
@@ -80,10 +126,32 @@ class DatabaseManager:
             self.equip_types = []
             self.skill_types = []
 
-        self.map_infos = loader.load_json("MapInfos.json") or []
-        self.common_events = loader.load_json("CommonEvents.json") or []
-        self.common_event_names = build_name_map(self.common_events, "公共事件")
-        self.tilesets = loader.load_json("Tilesets.json") or []
+        self.map_infos = loaded["MapInfos.json"] or []
+        self._map_infos_by_id = build_id_index(self.map_infos)
+        self._map_tree = None
+
+    def __getattr__(self, name):
+        filename = _LAZY_ATTRS.get(name)
+        if filename is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        with self._lazy_lock:
+            if name not in self.__dict__:
+                self._load_lazy_table(filename)
+        return self.__dict__[name]
+
+    def _load_lazy_table(self, filename):
+        data = self.loader.load_json(filename) or []
+        if filename == "Troops.json":
+            self.raw_troops = data
+            self._troops_by_id = build_id_index(data)
+            self.troops = build_name_map(data, "敌群")
+        elif filename == "CommonEvents.json":
+            self.common_events = data
+            self._common_events_by_id = build_id_index(data)
+            self.common_event_names = build_name_map(data, "公共事件")
+        elif filename == "Tilesets.json":
+            self.tilesets = data
+            self._tilesets_by_id = build_id_index(data)
 
     def get_item_name(self, item_id):
         return self.items.get(item_id, f"未知物品#{item_id}")
@@ -107,39 +175,25 @@ class DatabaseManager:
         return self.variables.get(var_id, f"变量#{var_id}")
 
     def get_map_name(self, map_id):
-        if isinstance(self.map_infos, list):
-            for info in self.map_infos:
-                if info and isinstance(info, dict) and info.get("id") == map_id:
-                    return info.get("name", f"地图#{map_id}")
-        return f"地图#{map_id}"
+        info = self._map_infos_by_id.get(map_id)
+        if info is None:
+            return f"地图#{map_id}"
+        return info.get("name", f"地图#{map_id}")
 
     def get_common_event_name(self, ce_id):
         return self.common_event_names.get(ce_id, f"公共事件#{ce_id}")
 
     def get_common_event(self, ce_id):
-        if isinstance(self.common_events, list):
-            for ce in self.common_events:
-                if ce and isinstance(ce, dict) and ce.get("id") == ce_id:
-                    return ce
-        return None
+        return self._common_events_by_id.get(ce_id)
 
     def get_troop_name(self, troop_id):
         return self.troops.get(troop_id, f"敌群#{troop_id}")
 
     def get_troop(self, troop_id):
-        if isinstance(self.raw_troops, list):
-            for t in self.raw_troops:
-                if t and isinstance(t, dict) and t.get("id") == troop_id:
-                    return t
-        return None
+        return self._troops_by_id.get(troop_id)
 
     def get_tileset(self, tileset_id):
-        if not isinstance(self.tilesets, list):
-            return None
-        for ts in self.tilesets:
-            if ts and isinstance(ts, dict) and ts.get("id") == tileset_id:
-                return ts
-        return None
+        return self._tilesets_by_id.get(tileset_id)
 
     def get_tileset_flags(self, tileset_id):
         ts = self.get_tileset(tileset_id)
@@ -169,6 +223,12 @@ class DatabaseManager:
         return []
 
     def get_map_tree(self):
+        # MapInfos 在一个 DatabaseManager 生命周期内不变（换游戏/刷新会重建实例），树只建一次
+        if self._map_tree is None:
+            self._map_tree = self._build_map_tree()
+        return self._map_tree
+
+    def _build_map_tree(self):
         infos = self.map_infos
         if not isinstance(infos, list):
             return []
@@ -184,18 +244,24 @@ class DatabaseManager:
         for pid in children_map:
             children_map[pid].sort(key=lambda x: info_dict.get(x, {}).get("order", 0))
 
-        def build_tree(parent_id):
-            nodes = []
+        # 用显式栈代替递归；每个父节点只展开一次，parentId 成环时也不会死循环
+        tree = []
+        expanded = {0}
+        stack = [(0, tree)]
+        while stack:
+            parent_id, nodes = stack.pop()
             for cid in children_map.get(parent_id, []):
                 info = info_dict.get(cid, {})
-                nodes.append({
+                node = {
                     "id": cid,
                     "name": info.get("name", f"地图#{cid}"),
-                    "children": build_tree(cid),
-                })
-            return nodes
-
-        return build_tree(0)
+                    "children": [],
+                }
+                nodes.append(node)
+                if cid not in expanded:
+                    expanded.add(cid)
+                    stack.append((cid, node["children"]))
+        return tree
 
     def get_element_name(self, eid):
         if 0 < eid < len(self.elements):
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+
 from .database import DatabaseManager
 
 PARAM_NAMES = ["最大HP", "最大MP", "攻击力", "防御力", "魔法攻击", "魔法防御", "敏捷", "幸运"]
@@ -11,6 +13,14 @@ SPARAM_NAMES = ["受击率", "防御效果", "恢复效果", "药理知识", "MP
                 "TP补充率", "物理伤害率", "魔法伤害率", "地形伤害率", "经验获取率"]
 OCCASION_MAP = {0: "随时", 1: "战斗中", 2: "菜单中", 3: "无法使用"}
 HIT_TYPE_MAP = {0: "必中", 1: "物理", 2: "魔法"}
+SCOPE_MAP = {0: "无", 1: "敌单体", 2: "敌全体", 3: "敌1~2体", 4: "敌2体随机",
+             5: "敌3体随机", 6: "敌4体随机", 7: "友单体", 8: "友全体",
+             9: "友方死亡单体", 10: "友方死亡全体", 11: "使用者"}
+ITEM_TYPE_MAP = {1: "普通物品", 2: "关键物品", 3: "隐藏物品A", 4: "隐藏物品B"}
+DROP_KIND_LABELS = {1: "物品", 2: "武器", 3: "防具"}
+# 掉落文本的 "种类:" 前缀和常见分母的掉率文本预先拼好，逐条掉落只剩一次格式化
+_DROP_KIND_PREFIXES = {kind: f"{label}:" for kind, label in DROP_KIND_LABELS.items()}
+_DROP_RATE_TEXTS = {denom: (f"1/{denom}" if denom > 1 else "100%") for denom in range(1, 101)}
 DAMAGE_TYPE_MAP = {
     0: "无",
     1: "HP伤害",
@@ -22,154 +32,143 @@ DAMAGE_TYPE_MAP = {
 }
 
 
-def translate_trait(t, db):
-    """将单个 trait 翻译为可读文本"""
-    code = t.get("code", 0)
-    did = t.get("dataId", 0)
-    val = t.get("value", 0)
+def _param_name(did):
+    return PARAM_NAMES[did] if did < 8 else "?"
+
+
+def _type_name(types, did):
+    return types[did] if did < len(types) else f"#{did}"
+
+
+def _xparam_trait(did, val, db):
+    name = XPARAM_NAMES[did] if did < 10 else f"追加能力{did}"
+    v = val * 100
+    sign = "+" if v >= 0 else ""
+    return f"{name}{sign}{v:.0f}%"
+
+
+_SPECIAL_FLAG_NAMES = {0: "自动战斗", 1: "防御", 2: "替身", 3: "TP持续"}
+_COLLAPSE_NAMES = {0: "普通", 1: "BOSS", 2: "瞬间消失", 3: "不消失"}
+_PARTY_ABILITY_NAMES = {0: "遇敌减半", 1: "无遇敌", 2: "取消偷袭",
+                        3: "先发制人率提升", 4: "金币双倍", 5: "掉落双倍"}
+
+# trait code -> 处理函数 (dataId, value, db) -> 文本；按 code 一次查表分派
+_TRAIT_HANDLERS = {
     # 11: 属性有效度
-    if code == 11:
-        rate = int(val * 100)
-        return f"{db.get_element_name(did)}耐性 {rate}%"
+    11: lambda did, val, db: f"{db.get_element_name(did)}耐性 {val:.0%}",
     # 12: 弱体有效度
-    if code == 12:
-        return f"{PARAM_NAMES[did] if did < 8 else '?'}弱体有效度 {int(val*100)}%"
+    12: lambda did, val, db: f"{_param_name(did)}弱体有效度 {val:.0%}",
     # 13: 状态有效度
-    if code == 13:
-        return f"{db.get_state_name(did)}有效度 {int(val*100)}%"
+    13: lambda did, val, db: f"{db.get_state_name(did)}有效度 {val:.0%}",
     # 14: 状态免疫
-    if code == 14:
-        return f"免疫{db.get_state_name(did)}"
+    14: lambda did, val, db: f"免疫{db.get_state_name(did)}",
     # 21: 通常能力值
-    if code == 21:
-        return f"{PARAM_NAMES[did] if did < 8 else '?'} ×{int(val*100)}%"
+    21: lambda did, val, db: f"{_param_name(did)} ×{val:.0%}",
     # 22: 追加能力值
-    if code == 22:
-        name = XPARAM_NAMES[did] if did < 10 else f"追加能力{did}"
-        v = val * 100
-        sign = "+" if v >= 0 else ""
-        return f"{name}{sign}{v:.0f}%"
+    22: _xparam_trait,
     # 23: 特殊能力值
-    if code == 23:
-        name = SPARAM_NAMES[did] if did < 10 else f"特殊能力{did}"
-        return f"{name} ×{int(val*100)}%"
+    23: lambda did, val, db: f"{SPARAM_NAMES[did] if did < 10 else f'特殊能力{did}'} ×{val:.0%}",
     # 31: 攻击属性
-    if code == 31:
-        return f"攻击属性:{db.get_element_name(did)}"
+    31: lambda did, val, db: f"攻击属性:{db.get_element_name(did)}",
     # 32: 攻击状态
-    if code == 32:
-        return f"攻击附加{db.get_state_name(did)} {int(val*100)}%"
+    32: lambda did, val, db: f"攻击附加{db.get_state_name(did)} {val:.0%}",
     # 33: 攻击速度补正
-    if code == 33:
-        return f"攻击速度{'+' if val>=0 else ''}{int(val)}"
+    33: lambda did, val, db: f"攻击速度{'+' if val>=0 else ''}{int(val)}",
     # 34: 攻击追加次数
-    if code == 34:
-        return f"攻击次数+{int(val)}"
+    34: lambda did, val, db: f"攻击次数+{int(val)}",
     # 41: 添加技能类型
-    if code == 41:
-        stn = db.skill_types[did] if did < len(db.skill_types) else f"#{did}"
-        return f"可用技能类型:{stn}"
+    41: lambda did, val, db: f"可用技能类型:{_type_name(db.skill_types, did)}",
     # 42: 封印技能类型
-    if code == 42:
-        stn = db.skill_types[did] if did < len(db.skill_types) else f"#{did}"
-        return f"封印技能类型:{stn}"
+    42: lambda did, val, db: f"封印技能类型:{_type_name(db.skill_types, did)}",
     # 43: 添加技能
-    if code == 43:
-        return f"习得技能:{db.get_skill_name(did)}"
+    43: lambda did, val, db: f"习得技能:{db.get_skill_name(did)}",
     # 44: 封印技能
-    if code == 44:
-        return f"封印技能:{db.get_skill_name(did)}"
+    44: lambda did, val, db: f"封印技能:{db.get_skill_name(did)}",
     # 51: 装备武器类型
-    if code == 51:
-        wtn = db.weapon_types[did] if did < len(db.weapon_types) else f"#{did}"
-        return f"可装备武器:{wtn}"
+    51: lambda did, val, db: f"可装备武器:{_type_name(db.weapon_types, did)}",
     # 52: 装备防具类型
-    if code == 52:
-        atn = db.armor_types[did] if did < len(db.armor_types) else f"#{did}"
-        return f"可装备防具:{atn}"
+    52: lambda did, val, db: f"可装备防具:{_type_name(db.armor_types, did)}",
     # 53: 固定装备
-    if code == 53:
-        etn = db.equip_types[did] if did < len(db.equip_types) else f"#{did}"
-        return f"固定装备:{etn}"
+    53: lambda did, val, db: f"固定装备:{_type_name(db.equip_types, did)}",
     # 54: 封印装备
-    if code == 54:
-        etn = db.equip_types[did] if did < len(db.equip_types) else f"#{did}"
-        return f"封印装备:{etn}"
+    54: lambda did, val, db: f"封印装备:{_type_name(db.equip_types, did)}",
     # 55: 槽位类型
-    if code == 55:
-        return "双持武器" if did == 1 else f"槽位类型{did}"
+    55: lambda did, val, db: "双持武器" if did == 1 else f"槽位类型{did}",
     # 61: 行动次数追加
-    if code == 61:
-        return f"行动次数+{int(val*100)}%"
+    61: lambda did, val, db: f"行动次数+{val:.0%}",
     # 62: 特殊标志
-    if code == 62:
-        flags = {0: "自动战斗", 1: "防御", 2: "替身", 3: "TP持续"}
-        return flags.get(did, f"特殊标志{did}")
+    62: lambda did, val, db: _SPECIAL_FLAG_NAMES.get(did, f"特殊标志{did}"),
     # 63: 消灭效果
-    if code == 63:
-        effs = {0: "普通", 1: "BOSS", 2: "瞬间消失", 3: "不消失"}
-        return f"消灭效果:{effs.get(did, f'#{did}')}"
+    63: lambda did, val, db: f"消灭效果:{_COLLAPSE_NAMES.get(did, f'#{did}')}",
     # 64: 队伍能力
-    if code == 64:
-        pabs = {0: "遇敌减半", 1: "无遇敌", 2: "取消偷袭",
-                3: "先发制人率提升", 4: "金币双倍", 5: "掉落双倍"}
-        return pabs.get(did, f"队伍能力{did}")
-    return f"特性[{code},{did},{val}]"
+    64: lambda did, val, db: _PARTY_ABILITY_NAMES.get(did, f"队伍能力{did}"),
+}
+
+
+def translate_trait(t, db):
+    """将单个 trait 翻译为可读文本"""
+    code = t.get("code", 0)
+    did = t.get("dataId", 0)
+    val = t.get("value", 0)
+    handler = _TRAIT_HANDLERS.get(code)
+    return handler(did, val, db) if handler else f"特性[{code},{did},{val}]"
+
+
+def _recover_effect(label):
+    def handler(did, v1, v2, db):
+        parts = []
+        if v1: parts.append(f"{v1:.0%}")
+        if v2: parts.append(f"{int(v2)}")
+        return f"{label} {'+'.join(parts)}" if parts else label
+    return handler
+
+
+# effect code -> 处理函数 (dataId, value1, value2, db) -> 文本
+_EFFECT_HANDLERS = {
+    11: _recover_effect("恢复HP"),  # 恢复HP
+    12: _recover_effect("恢复MP"),  # 恢复MP
+    13: lambda did, v1, v2, db: f"恢复TP {int(v1)}",  # 恢复TP
+    21: lambda did, v1, v2, db: f"附加{db.get_state_name(did)} {v1:.0%}",  # 附加状态
+    22: lambda did, v1, v2, db: f"解除{db.get_state_name(did)} {v1:.0%}",  # 解除状态
+    31: lambda did, v1, v2, db: f"强化{_param_name(did)} {int(v1)}回合",  # 强化
+    32: lambda did, v1, v2, db: f"弱化{_param_name(did)} {int(v1)}回合",  # 弱化
+    33: lambda did, v1, v2, db: f"解除强化{_param_name(did)}",  # 解除强化
+    34: lambda did, v1, v2, db: f"解除弱化{_param_name(did)}",  # 解除弱化
+    41: lambda did, v1, v2, db: "逃跑" if did == 0 else f"特殊效果{did}",  # 特殊效果
+    42: lambda did, v1, v2, db: f"永久{_param_name(did)}+{int(v1)}",  # 成长
+    43: lambda did, v1, v2, db: f"习得{db.get_skill_name(did)}",  # 学习技能
+    44: lambda did, v1, v2, db: f"触发公共事件#{did}",  # 公共事件
+}
 
 
 def translate_effect(e, db):
     """将单个 effect (物品使用效果) 翻译为可读文本"""
     code = e.get("code", 0)
     did = e.get("dataId", 0)
-    v1 = e.get("value1", 0)
-    v2 = e.get("value2", 0)
-    if code == 11:  # 恢复HP
-        parts = []
-        if v1: parts.append(f"{int(v1*100)}%")
-        if v2: parts.append(f"{int(v2)}")
-        return f"恢复HP {'+'.join(parts)}" if parts else "恢复HP"
-    if code == 12:  # 恢复MP
-        parts = []
-        if v1: parts.append(f"{int(v1*100)}%")
-        if v2: parts.append(f"{int(v2)}")
-        return f"恢复MP {'+'.join(parts)}" if parts else "恢复MP"
-    if code == 13:  # 恢复TP
-        return f"恢复TP {int(v1)}"
-    if code == 21:  # 附加状态
-        return f"附加{db.get_state_name(did)} {int(v1*100)}%"
-    if code == 22:  # 解除状态
-        return f"解除{db.get_state_name(did)} {int(v1*100)}%"
-    if code == 31:  # 强化
-        return f"强化{PARAM_NAMES[did] if did<8 else '?'} {int(v1)}回合"
-    if code == 32:  # 弱化
-        return f"弱化{PARAM_NAMES[did] if did<8 else '?'} {int(v1)}回合"
-    if code == 33:  # 解除强化
-        return f"解除强化{PARAM_NAMES[did] if did<8 else '?'}"
-    if code == 34:  # 解除弱化
-        return f"解除弱化{PARAM_NAMES[did] if did<8 else '?'}"
-    if code == 41:  # 特殊效果
-        return "逃跑" if did == 0 else f"特殊效果{did}"
-    if code == 42:  # 成长
-        return f"永久{PARAM_NAMES[did] if did<8 else '?'}+{int(v1)}"
-    if code == 43:  # 学习技能
-        return f"习得{db.get_skill_name(did)}"
-    if code == 44:  # 公共事件
-        return f"触发公共事件#{did}"
-    return f"效果[{code},{did}]"
+    handler = _EFFECT_HANDLERS.get(code)
+    if handler is None:
+        return f"效果[{code},{did}]"
+    return handler(did, e.get("value1", 0), e.get("value2", 0), db)
+
+
+def _int_field(value, default):
+    """等价于 int(value or default)；JSON 里的整数字段（绝大多数情况）直接返回，不再走 int()。"""
+    if value and type(value) is int:
+        return value
+    return int(value or default)
 
 
 def _safe_name(arr, idx, fallback="?"):
-    try:
-        if isinstance(arr, list) and 0 <= idx < len(arr):
-            name = arr[idx]
-            if isinstance(name, str) and name.strip():
-                return name.strip()
-    except Exception:  # noqa: BLE001
-        pass
+    if isinstance(arr, list) and isinstance(idx, int) and 0 <= idx < len(arr):
+        name = arr[idx]
+        if isinstance(name, str) and name.strip():
+            return name.strip()
     return fallback
 
 
+@lru_cache(maxsize=1024)
 def _formula_pretty(formula: str) -> str:
+    # 大量技能共用同一条公式（如默认的 a.atk * 4 - b.def * 2），按原文缓存改写结果
     text = (formula or "").strip()
     if not text:
         return ""
@@ -184,11 +183,12 @@ def _formula_pretty(formula: str) -> str:
 def _extract_skill_damage(skill, db):
     damage = skill.get("damage")
     if isinstance(damage, dict) and damage:
-        dtype = int(damage.get("type", 0) or 0)
-        eid = int(damage.get("elementId", -1) or -1)
-        formula = str(damage.get("formula", "") or "").strip()
-        variance = int(damage.get("variance", 0) or 0)
-        critical = bool(damage.get("critical", False))
+        get = damage.get
+        dtype = _int_field(get("type"), 0)
+        eid = _int_field(get("elementId"), -1)
+        formula = str(get("formula", "") or "").strip()
+        variance = _int_field(get("variance"), 0)
+        critical = bool(get("critical", False))
         if eid == -1:
             element = "普通攻击属性"
         elif eid == 0:
@@ -212,18 +212,21 @@ def _extract_skill_damage(skill, db):
     # VX 旧版：无公式脚本，按参数机制结算
     legacy = skill.get("legacyDamage")
     if isinstance(legacy, dict):
-        base = int(legacy.get("baseDamage", 0) or 0)
-        atk_f = int(legacy.get("atkF", 0) or 0)
-        spi_f = int(legacy.get("spiF", 0) or 0)
-        var = int(legacy.get("variance", 0) or 0)
+        base = _int_field(legacy.get("baseDamage"), 0)
+        atk_f = _int_field(legacy.get("atkF"), 0)
+        spi_f = _int_field(legacy.get("spiF"), 0)
+        var = _int_field(legacy.get("variance"), 0)
         elem_set = legacy.get("elementSet", [])
         elems = []
         if isinstance(elem_set, list):
             for eid in elem_set:
-                try:
-                    elems.append(db.get_element_name(int(eid)))
-                except Exception:  # noqa: BLE001
-                    continue
+                # 正常数据都是整数，只有其他类型才尝试转换（转换失败的跳过）
+                if type(eid) is not int:
+                    try:
+                        eid = int(eid)
+                    except (TypeError, ValueError):
+                        continue
+                elems.append(db.get_element_name(eid))
         return {
             "damageType": "引擎旧版伤害",
             "damageElement": "、".join(elems) if elems else "按技能属性",
@@ -255,12 +258,20 @@ def _extract_skill_damage(skill, db):
     }
 
 
+def _valid_named_record(record):
+    """记录是字典且名称非空时返回去掉空白的名称，否则返回 None。"""
+    name = record.get("name") if isinstance(record, dict) else None
+    if not name or not isinstance(name, str):
+        return None
+    return name.strip() or None
+
+
+def _unknown_drop_name(data_id):
+    return f"#{data_id}"
+
+
 def build_encyclopedia(db, asset_resolver=None):
     """构建图鉴数据，返回 {weapons, armors, items, enemies, skills}"""
-    scope_map = {0: "无", 1: "敌单体", 2: "敌全体", 3: "敌1~2体", 4: "敌2体随机",
-                 5: "敌3体随机", 6: "敌4体随机", 7: "友单体", 8: "友全体",
-                 9: "友方死亡单体", 10: "友方死亡全体", 11: "使用者"}
-
     def proc_params(p):
         """将 params[8] 转为非零属性列表"""
         out = []
@@ -272,12 +283,17 @@ def build_encyclopedia(db, asset_resolver=None):
     def proc_traits(traits):
         return [translate_trait(t, db) for t in (traits or [])]
 
+    # 类型名表在循环里每条记录都要查，先绑定成局部变量并算好长度
+    wtypes, atypes, etypes = db.weapon_types, db.armor_types, db.equip_types
+    wtypes_len, atypes_len, etypes_len = len(wtypes), len(atypes), len(etypes)
+
     # --- 武器 ---
     weapons = []
     for w in db.raw_weapons:
-        if not w or not isinstance(w, dict) or not w.get("name", "").strip():
+        if not _valid_named_record(w):
             continue
-        wtn = db.weapon_types[w.get("wtypeId", 0)] if w.get("wtypeId", 0) < len(db.weapon_types) else "?"
+        wtype_id = w.get("wtypeId", 0)
+        wtn = wtypes[wtype_id] if wtype_id < wtypes_len else "?"
         weapons.append({
             "id": w["id"], "name": w["name"], "desc": w.get("description", ""),
             "price": w.get("price", 0), "wtype": wtn,
@@ -289,10 +305,12 @@ def build_encyclopedia(db, asset_resolver=None):
     # --- 防具 ---
     armors = []
     for a in db.raw_armors:
-        if not a or not isinstance(a, dict) or not a.get("name", "").strip():
+        if not _valid_named_record(a):
             continue
-        atn = db.armor_types[a.get("atypeId", 0)] if a.get("atypeId", 0) < len(db.armor_types) else "?"
-        etn = db.equip_types[a.get("etypeId", 0)] if a.get("etypeId", 0) < len(db.equip_types) else "?"
+        atype_id = a.get("atypeId", 0)
+        etype_id = a.get("etypeId", 0)
+        atn = atypes[atype_id] if atype_id < atypes_len else "?"
+        etn = etypes[etype_id] if etype_id < etypes_len else "?"
         armors.append({
             "id": a["id"], "name": a["name"], "desc": a.get("description", ""),
             "price": a.get("price", 0), "atype": atn, "etype": etn,
@@ -304,16 +322,15 @@ def build_encyclopedia(db, asset_resolver=None):
     # --- 物品 ---
     items = []
     for it in db.raw_items:
-        if not it or not isinstance(it, dict) or not it.get("name", "").strip():
+        if not _valid_named_record(it):
             continue
-        itype = {1: "普通物品", 2: "关键物品", 3: "隐藏物品A", 4: "隐藏物品B"}
         items.append({
             "id": it["id"], "name": it["name"], "desc": it.get("description", ""),
             "price": it.get("price", 0),
             "iconIndex": it.get("iconIndex", 0),
-            "itype": itype.get(it.get("itypeId", 1), "物品"),
+            "itype": ITEM_TYPE_MAP.get(it.get("itypeId", 1), "物品"),
             "consumable": it.get("consumable", True),
-            "scope": scope_map.get(it.get("scope", 0), "?"),
+            "scope": SCOPE_MAP.get(it.get("scope", 0), "?"),
             "effects": [translate_effect(e, db) for e in (it.get("effects") or [])]
         })
 
@@ -321,7 +338,7 @@ def build_encyclopedia(db, asset_resolver=None):
     drop_kind = {1: db.get_item_name, 2: db.get_weapon_name, 3: db.get_armor_name}
     enemies = []
     for en in db.raw_enemies:
-        if not en or not isinstance(en, dict) or not en.get("name", "").strip():
+        if not _valid_named_record(en):
             continue
         if en["name"].startswith("ーー"):
             continue
@@ -330,11 +347,11 @@ def build_encyclopedia(db, asset_resolver=None):
             k = d.get("kind", 0)
             if k == 0:
                 continue
-            fn = drop_kind.get(k, lambda x: f"#{x}")
-            kind_label = {1: "物品", 2: "武器", 3: "防具"}.get(k, "?")
+            fn = drop_kind.get(k, _unknown_drop_name)
+            prefix = _DROP_KIND_PREFIXES.get(k, "?:")
             denom = d.get("denominator", 1)
-            rate = f"1/{denom}" if denom > 1 else "100%"
-            drops.append(f"{kind_label}:{fn(d.get('dataId', 0))} ({rate})")
+            rate = _DROP_RATE_TEXTS.get(denom) or (f"1/{denom}" if denom > 1 else "100%")
+            drops.append(f"{prefix}{fn(d.get('dataId', 0))} ({rate})")
         actions = []
         for act in (en.get("actions") or []):
             sid = act.get("skillId", 0)
@@ -361,9 +378,9 @@ def build_encyclopedia(db, asset_resolver=None):
     # --- 技能 ---
     skills = []
     for sk in db.raw_skills:
-        if not sk or not isinstance(sk, dict) or not sk.get("name", "").strip():
+        if not _valid_named_record(sk):
             continue
-        stype_id = int(sk.get("stypeId", 0) or 0)
+        stype_id = _int_field(sk.get("stypeId"), 0)
         damage_meta = _extract_skill_damage(sk, db)
         skills.append(
             {
@@ -372,15 +389,15 @@ def build_encyclopedia(db, asset_resolver=None):
                 "desc": sk.get("description", ""),
                 "iconIndex": sk.get("iconIndex", 0),
                 "stype": _safe_name(db.skill_types, stype_id, f"类型#{stype_id}"),
-                "scope": scope_map.get(int(sk.get("scope", 0) or 0), "?"),
-                "occasion": OCCASION_MAP.get(int(sk.get("occasion", 0) or 0), "?"),
-                "hitType": HIT_TYPE_MAP.get(int(sk.get("hitType", 0) or 0), "?"),
-                "mpCost": int(sk.get("mpCost", 0) or 0),
-                "tpCost": int(sk.get("tpCost", 0) or 0),
-                "tpGain": int(sk.get("tpGain", 0) or 0),
-                "speed": int(sk.get("speed", 0) or 0),
-                "repeats": int(sk.get("repeats", 1) or 1),
-                "successRate": int(sk.get("successRate", 100) or 100),
+                "scope": SCOPE_MAP.get(_int_field(sk.get("scope"), 0), "?"),
+                "occasion": OCCASION_MAP.get(_int_field(sk.get("occasion"), 0), "?"),
+                "hitType": HIT_TYPE_MAP.get(_int_field(sk.get("hitType"), 0), "?"),
+                "mpCost": _int_field(sk.get("mpCost"), 0),
+                "tpCost": _int_field(sk.get("tpCost"), 0),
+                "tpGain": _int_field(sk.get("tpGain"), 0),
+                "speed": _int_field(sk.get("speed"), 0),
+                "repeats": _int_field(sk.get("repeats"), 1),
+                "successRate": _int_field(sk.get("successRate"), 100),
                 "effects": [translate_effect(e, db) for e in (sk.get("effects") or [])],
                 **damage_meta,
             }
@@ -2,27 +2,76 @@
 
 from __future__ import annotations
 
+import io
+from concurrent.futures import ThreadPoolExecutor
+
 from .data_loader import DataLoader
 from .database import DatabaseManager
 from .interpreter import EventInterpreter
 
+_EXPORT_WORKERS = 4
+# 导出会用到的事件指令：对话(101/401)、开关(121/123)、金币(125)、物品/武器/防具(126~128)、场所移动(201)
+_EXPORT_CODES = frozenset((101, 121, 123, 125, 126, 127, 128, 201, 401))
+
+
+def _format_treasure(t):
+    items = ", ".join(t["items"]) if t["items"] else "未知"
+    conds = "；".join(t["conditions"]) if t["conditions"] else "无"
+    return f"- ({t['x']},{t['y']}) {t['name']} | {items} | 条件: {conds}"
+
+
+def _format_key_event(k):
+    reasons = []
+    if k["switch_ops"]:
+        reasons.append("开关: " + "; ".join(k["switch_ops"]))
+    if k["key_items"]:
+        reasons.append("消耗: " + ", ".join(k["key_items"]))
+    line = f"- ({k['x']},{k['y']}) {k['name']}"
+    if reasons:
+        line += f" | {' | '.join(reasons)}"
+    return line
+
+
+def _format_transfer(tr):
+    targets = "; ".join(tr["targets"]) if tr["targets"] else "变量指定位置"
+    return f"- ({tr['x']},{tr['y']}) {tr['name']} -> {targets}"
+
+
+def _format_npc(n):
+    return f"- ({n['x']},{n['y']}) {n['name']}"
+
+
+# (导出结果字段, 小节标题, 单行格式化函数)，按输出顺序排列
+_EXPORT_SECTIONS = (
+    ("treasures", "Treasure (宝箱)", _format_treasure),
+    ("key_events", "Key Events (关键事件)", _format_key_event),
+    ("transfers", "Transfers (传送点)", _format_transfer),
+    ("npcs", "NPC (普通对话)", _format_npc),
+)
+
+
+def _emit_section(write, title, records, fmt):
+    """写出一个小节：标题 + 每条记录一行（无记录时写 "- 无"）+ 空行。"""
+    if records:
+        body = "\n".join(map(fmt, records))
+    else:
+        body = "- 无"
+    write(f"### {title}\n{body}\n\n")
+
 
 class ExportService:
     def __init__(self, loader: DataLoader, db: DatabaseManager, interpreter: EventInterpreter):
         self.loader = loader
         self.db = db
         self.interpreter = interpreter
+        # map_id -> 导出结果（地图不存在时为 None）。loader 在同一上下文内也缓存地图 JSON，
+        # 结果不会过期；同一次请求里先校验再生成 Markdown 时也不必重复收集
+        self._export_cache: dict[int, dict | None] = {}
 
     @staticmethod
     def _dedupe(items):
-        seen = set()
-        out = []
-        for it in items:
-            if it in seen:
-                continue
-            seen.add(it)
-            out.append(it)
-        return out
+        # dict 保持插入顺序，等价于按首次出现顺序去重
+        return list(dict.fromkeys(items))
 
     def _format_amount(self, op_t, val):
         if op_t == 0:
@@ -43,80 +92,95 @@ class ExportService:
             "key_item_consumes": [],
         }
 
+        # 指令循环是导出的热点：数据库查询方法和结果列表的 append 先绑定为局部变量
+        db = self.db
+        get_switch_name = db.get_switch_name
+        get_item_name = db.get_item_name
+        format_amount = self._format_amount
+        add_switch_op = info["switch_ops"].append
+        add_transfer = info["transfer_targets"].append
+        add_key_item = info["key_item_consumes"].append
+
         pages = evt.get("pages", []) or []
         for page in pages:
-            if page is None or not isinstance(page, dict):
+            if not isinstance(page, dict):
                 continue
-            conditions = self.interpreter._parse_conditions(page.get("conditions", {}))
             cmd_list = page.get("list", []) or []
             page_treasure = []
 
             for cmd in cmd_list:
                 if not isinstance(cmd, dict):
                     continue
-                code = cmd.get("code", 0)
-                p = cmd.get("parameters", []) or []
+                get = cmd.get
+                code = get("code", 0)
+                # 绝大多数指令与导出无关，先用集合判断直接跳过
+                if code not in _EXPORT_CODES:
+                    continue
+                p = get("parameters", []) or []
 
-                if code in (101, 401):
+                if code == 101 or code == 401:
                     info["has_dialog"] = True
 
-                if code == 121:
+                elif code == 121:
                     sw_s = p[0] if len(p) > 0 else 0
                     sw_e = p[1] if len(p) > 1 else sw_s
                     v = "ON" if (p[2] if len(p) > 2 else 0) == 0 else "OFF"
                     if sw_s == sw_e:
-                        name = self.db.get_switch_name(sw_s)
+                        name = get_switch_name(sw_s)
                     else:
-                        name = f"{self.db.get_switch_name(sw_s)}~{self.db.get_switch_name(sw_e)}"
-                    info["switch_ops"].append(f"{name}={v}")
+                        name = f"{get_switch_name(sw_s)}~{get_switch_name(sw_e)}"
+                    add_switch_op(f"{name}={v}")
 
-                if code == 123:
+                elif code == 123:
                     ch = p[0] if len(p) > 0 else "A"
                     v = "ON" if (p[1] if len(p) > 1 else 0) == 0 else "OFF"
-                    info["switch_ops"].append(f"独立开关{ch}={v}")
-
-                if code == 126 and len(p) > 1 and p[1] == 1:
-                    item_id = p[0] if len(p) > 0 else 0
-                    if self.db.is_key_item(item_id):
-                        amount = self._format_amount(p[2] if len(p) > 2 else 0, p[3] if len(p) > 3 else 0)
-                        info["key_item_consumes"].append(f"{self.db.get_item_name(item_id)} x{amount}")
+                    add_switch_op(f"独立开关{ch}={v}")
 
-                if code == 201:
+                elif code == 201:
                     method = p[0] if len(p) > 0 else 0
                     if method == 0:
                         mid = p[1] if len(p) > 1 else 0
                         x = p[2] if len(p) > 2 else 0
                         y = p[3] if len(p) > 3 else 0
-                        mname = self.db.get_map_name(mid)
-                        info["transfer_targets"].append(f"{mname} (#{mid}) ({x},{y})")
+                        mname = db.get_map_name(mid)
+                        add_transfer(f"{mname} (#{mid}) ({x},{y})")
                     else:
-                        info["transfer_targets"].append("变量指定位置")
-
-                if code == 125 and len(p) > 0 and p[0] == 0:
-                    op_t = p[1] if len(p) > 1 else 0
-                    val = p[2] if len(p) > 2 else 0
-                    amount = self._format_amount(op_t, val)
-                    page_treasure.append(f"金币 +{amount}")
-
-                if code in (126, 127, 128) and len(p) > 1 and p[1] == 0:
-                    item_id = p[0] if len(p) > 0 else 0
-                    op_t = p[2] if len(p) > 2 else 0
-                    val = p[3] if len(p) > 3 else 0
-                    amount = self._format_amount(op_t, val)
-                    if code == 126:
-                        label = "物品"
-                        name = self.db.get_item_name(item_id)
-                    elif code == 127:
-                        label = "武器"
-                        name = self.db.get_weapon_name(item_id)
-                    else:
-                        label = "防具"
-                        name = self.db.get_armor_name(item_id)
-                    page_treasure.append(f"{label}: {name} x{amount}")
-
+                        add_transfer("变量指定位置")
+
+                elif code == 125:
+                    if len(p) > 0 and p[0] == 0:
+                        op_t = p[1] if len(p) > 1 else 0
+                        val = p[2] if len(p) > 2 else 0
+                        amount = format_amount(op_t, val)
+                        page_treasure.append(f"金币 +{amount}")
+
+                # 126/127/128：增减物品/武器/防具
+                elif len(p) > 1:
+                    if p[1] == 1 and code == 126:
+                        item_id = p[0]
+                        if db.is_key_item(item_id):
+                            amount = format_amount(p[2] if len(p) > 2 else 0, p[3] if len(p) > 3 else 0)
+                            add_key_item(f"{get_item_name(item_id)} x{amount}")
+                    elif p[1] == 0:
+                        item_id = p[0]
+                        op_t = p[2] if len(p) > 2 else 0
+                        val = p[3] if len(p) > 3 else 0
+                        amount = format_amount(op_t, val)
+                        if code == 126:
+                            label = "物品"
+                            name = get_item_name(item_id)
+                        elif code == 127:
+                            label = "武器"
+                            name = db.get_weapon_name(item_id)
+                        else:
+                            label = "防具"
+                            name = db.get_armor_name(item_id)
+                        page_treasure.append(f"{label}: {name} x{amount}")
+
+            # 出现条件只在宝箱页用得到，找到宝箱后再解析
             if page_treasure and not info["treasure_items"]:
                 info["treasure_items"] = page_treasure
-                info["treasure_conditions"] = conditions
+                info["treasure_conditions"] = self.interpreter._parse_conditions(page.get("conditions", {}))
 
         info["transfer_targets"] = self._dedupe(info["transfer_targets"])
         info["switch_ops"] = self._dedupe(info["switch_ops"])
@@ -124,6 +188,15 @@ class ExportService:
         return info
 
     def build_map_export(self, map_id):
+        try:
+            return self._export_cache[map_id]
+        except KeyError:
+            pass
+        export = self._collect_map_export(map_id)
+        self._export_cache[map_id] = export
+        return export
+
+    def _collect_map_export(self, map_id):
         filename = f"Map{map_id:03d}.json"
         map_data = self.loader.load_json(filename)
         if map_data is None:
@@ -136,7 +209,7 @@ class ExportService:
         npcs = []
 
         for evt in (map_data.get("events", []) or []):
-            if evt is None or not isinstance(evt, dict):
+            if not isinstance(evt, dict):
                 continue
             info = self._collect_event_export_info(evt)
             is_treasure = bool(info["treasure_items"])
@@ -179,73 +252,35 @@ class ExportService:
         }
 
     def build_export_markdown(self, map_ids):
-        lines = ["# 攻略导出", ""]
-
-        for map_id in map_ids:
-            export = self.build_map_export(map_id)
+        buf = io.StringIO()
+        w = buf.write
+        w("# 攻略导出\n\n")
+
+        map_ids = list(map_ids)
+        if len(map_ids) > 1:
+            # 多张地图时并行读取/收集（地图 JSON 读取可与其他地图的收集重叠），按原顺序输出
+            with ThreadPoolExecutor(max_workers=min(_EXPORT_WORKERS, len(map_ids))) as pool:
+                exports = list(pool.map(self.build_map_export, map_ids))
+        else:
+            exports = [self.build_map_export(map_id) for map_id in map_ids]
+
+        for export in exports:
             if not export:
                 continue
-            lines.append(f"## {export['name']} (#{export['id']})")
-            lines.append("")
-
-            lines.append("### Treasure (宝箱)")
-            if not export["treasures"]:
-                lines.append("- 无")
-            else:
-                for t in export["treasures"]:
-                    items = ", ".join(t["items"]) if t["items"] else "未知"
-                    conds = "；".join(t["conditions"]) if t["conditions"] else "无"
-                    lines.append(f"- ({t['x']},{t['y']}) {t['name']} | {items} | 条件: {conds}")
-            lines.append("")
-
-            lines.append("### Key Events (关键事件)")
-            if not export["key_events"]:
-                lines.append("- 无")
-            else:
-                for k in export["key_events"]:
-                    reasons = []
-                    if k["switch_ops"]:
-                        reasons.append("开关: " + "; ".join(k["switch_ops"]))
-                    if k["key_items"]:
-                        reasons.append("消耗: " + ", ".join(k["key_items"]))
-                    reason_text = " | ".join(reasons) if reasons else ""
-                    line = f"- ({k['x']},{k['y']}) {k['name']}"
-                    if reason_text:
-                        line += f" | {reason_text}"
-                    lines.append(line)
-            lines.append("")
-
-            lines.append("### Transfers (传送点)")
-            if not export["transfers"]:
-                lines.append("- 无")
-            else:
-                for tr in export["transfers"]:
-                    targets = "; ".join(tr["targets"]) if tr["targets"] else "变量指定位置"
-                    lines.append(f"- ({tr['x']},{tr['y']}) {tr['name']} -> {targets}")
-            lines.append("")
-
-            lines.append("### NPC (普通对话)")
-            if not export["npcs"]:
-                lines.append("- 无")
-            else:
-                for n in export["npcs"]:
-                    lines.append(f"- ({n['x']},{n['y']}) {n['name']}")
-            lines.append("")
-
-        return "\n".join(lines).rstrip() + "\n"
+            w(f"## {export['name']} (#{export['id']})\n\n")
+            for key, title, fmt in _EXPORT_SECTIONS:
+                _emit_section(w, title, export[key], fmt)
+
+        return buf.getvalue().rstrip() + "\n"
 
     def get_all_map_ids(self):
         infos = self.db.map_infos if isinstance(self.db.map_infos, list) else []
-        items = []
-        seen = set()
+        # 同一 id 以首次出现的记录为准；dict 兼做去重集合，省掉中间的 (order, id) 元组列表
+        orders = {}
         for info in infos:
-            if info is None or not isinstance(info, dict):
+            if not isinstance(info, dict):
                 continue
             mid = info.get("id", 0)
-            if not mid or mid in seen:
-                continue
-            seen.add(mid)
-            items.append((info.get("order", 0), mid))
-        items.sort(key=lambda x: (x[0], x[1]))
-        return [mid for _, mid in items]
-
+            if mid and mid not in orders:
+                orders[mid] = info.get("order", 0)
+        return sorted(orders, key=lambda mid: (orders[mid], mid))
@@ -2,27 +2,90 @@
 
 from __future__ import annotations
 
+import atexit
+import queue
+import threading
+from concurrent.futures import Future
+
 from .errors import InvalidRequestError
 
+try:  # tkinter 属于可选组件，部分 Python 发行版不带
+    import tkinter as tk
+    from tkinter import filedialog
+except Exception:  # noqa: BLE001
+    tk = None
+    filedialog = None
+
+# Tk 对象只能在创建它的线程里使用，而每个 HTTP 请求各在一个线程中处理：
+# 隐藏的根窗口由一个常驻线程持有，对话框都排队到这个线程里打开，Tk 只需初始化一次。
+_jobs: queue.Queue[Future | None] = queue.Queue()
+_worker: threading.Thread | None = None
+_worker_lock = threading.Lock()
+
+
+def _destroy_root(root) -> None:
+    try:
+        root.destroy()
+    except Exception:  # noqa: BLE001
+        pass
+
+
+def _dialog_loop() -> None:
+    root = None
+    while True:
+        future = _jobs.get()
+        if future is None:
+            break
+        if not future.set_running_or_notify_cancel():
+            continue
+        try:
+            if root is None:
+                root = tk.Tk()
+                root.withdraw()
+                root.attributes("-topmost", True)
+            root.update()
+            selected = filedialog.askopenfilename(
+                parent=root,
+                title="选择 RPG Maker 游戏 EXE (MV/VX/VX Ace)",
+                filetypes=[("EXE 文件", "*.exe"), ("所有文件", "*.*")],
+            )
+            future.set_result(selected or "")
+        except Exception as exc:  # noqa: BLE001
+            future.set_exception(exc)
+            # 出错后根窗口状态不可信，下次重新创建
+            if root is not None:
+                _destroy_root(root)
+                root = None
+    if root is not None:
+        _destroy_root(root)
+
+
+def _stop_dialog_loop() -> None:
+    worker = _worker
+    if worker is not None and worker.is_alive():
+        _jobs.put(None)
+        worker.join(timeout=1.0)
+
+
+def _ensure_worker() -> None:
+    global _worker
+    with _worker_lock:
+        if _worker is not None and _worker.is_alive():
+            return
+        _worker = threading.Thread(target=_dialog_loop, name="file-dialog", daemon=True)
+        _worker.start()
+        atexit.register(_stop_dialog_loop)
+
 
 def pick_exe_file() -> str:
     """Open native file picker and return selected exe path or empty string."""
-    try:
-        import tkinter as tk
-        from tkinter import filedialog
-    except Exception as exc:  # noqa: BLE001
-        raise InvalidRequestError("当前环境不支持本地文件选择窗口（tkinter 不可用）") from exc
+    if tk is None:
+        raise InvalidRequestError("当前环境不支持本地文件选择窗口（tkinter 不可用）")
 
+    _ensure_worker()
+    future: Future = Future()
+    _jobs.put(future)
     try:
-        root = tk.Tk()
-        root.withdraw()
-        root.attributes("-topmost", True)
-        root.update()
-        selected = filedialog.askopenfilename(
-            title="选择 RPG Maker 游戏 EXE (MV/VX/VX Ace)",
-            filetypes=[("EXE 文件", "*.exe"), ("所有文件", "*.*")],
-        )
-        root.destroy()
-        return selected or ""
+        return future.result()
     except Exception as exc:  # noqa: BLE001
         raise InvalidRequestError(f"打开文件选择窗口失败: {exc}") from exc
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -15,13 +16,32 @@ class GameDiscoveryResult:
     archive_path: Path | None = None
 
 
-def _has_any(root: Path, pattern: str) -> bool:
-    if not root.exists():
-        return False
+_MAP_FILE_PREFIX = os.path.normcase("Map")
+
+
+def _list_names(directory: Path) -> frozenset[str]:
+    """列出目录下的条目名（normcase 后），目录不存在或不可读时为空集。"""
     try:
-        return any(root.glob(pattern))
-    except Exception:  # noqa: BLE001
-        return False
+        with os.scandir(directory) as it:
+            return frozenset(os.path.normcase(entry.name) for entry in it)
+    except OSError:
+        return frozenset()
+
+
+def _has_map_file(names: frozenset[str], suffix: str) -> bool:
+    """names 中是否存在 MapNNN<suffix>（三位数字编号）的地图文件。"""
+    suffix = os.path.normcase(suffix)
+    name_len = 6 + len(suffix)
+    for name in names:
+        if (
+            len(name) == name_len
+            and name.startswith(_MAP_FILE_PREFIX)
+            and name.endswith(suffix)
+            and name[3:6].isascii()
+            and name[3:6].isdigit()
+        ):
+            return True
+    return False
 
 
 def discover_game_from_exe(exe_path: str | Path) -> GameDiscoveryResult:
@@ -32,36 +52,46 @@ def discover_game_from_exe(exe_path: str | Path) -> GameDiscoveryResult:
         raise InvalidRequestError(f"不是 EXE 文件: {exe}")
 
     root = exe.parent
+    # 游戏根目录只列一次，各引擎的标记文件/目录都从这份列表里判断，不再逐个 stat
+    root_names = _list_names(root)
+
+    def in_root(name: str) -> bool:
+        return os.path.normcase(name) in root_names
 
     # RPG Maker MV/MZ
     candidates = [
-        root / "www" / "data",
-        root / "data",
+        ("www", root / "www" / "data"),
+        ("data", root / "data"),
     ]
-    for data_dir in candidates:
-        if (data_dir / "MapInfos.json").exists():
+    for top, data_dir in candidates:
+        if in_root(top) and (data_dir / "MapInfos.json").exists():
             return GameDiscoveryResult(engine="mv", data_dir=data_dir.resolve(), archive_path=None)
 
-    # RPG Maker VX Ace (RGSS3)
     data_dir = root / "Data"
+    data_names = _list_names(data_dir) if in_root("Data") else frozenset()
+
+    # RPG Maker VX Ace (RGSS3)
     rgss3_archive = root / "Game.rgss3a"
-    has_vxace_maps = (data_dir / "MapInfos.rvdata2").exists() or _has_any(data_dir, "Map[0-9][0-9][0-9].rvdata2")
-    if rgss3_archive.exists() or has_vxace_maps:
+    has_rgss3 = in_root(rgss3_archive.name)
+    has_vxace_maps = os.path.normcase("MapInfos.rvdata2") in data_names or _has_map_file(data_names, ".rvdata2")
+    if has_rgss3 or has_vxace_maps:
         return GameDiscoveryResult(
             engine="vxace",
             data_dir=data_dir.resolve(),
-            archive_path=rgss3_archive.resolve() if rgss3_archive.exists() else None,
+            archive_path=rgss3_archive.resolve() if has_rgss3 else None,
         )
 
     # RPG Maker VX (RGSS2)
     rgss2_archive = root / "Game.rgss2a"
     rgssad_archive = root / "Game.rgssad"
-    has_vx_maps = (data_dir / "MapInfos.rvdata").exists() or _has_any(data_dir, "Map[0-9][0-9][0-9].rvdata")
-    if rgss2_archive.exists() or rgssad_archive.exists() or has_vx_maps:
+    has_rgss2 = in_root(rgss2_archive.name)
+    has_rgssad = in_root(rgssad_archive.name)
+    has_vx_maps = os.path.normcase("MapInfos.rvdata") in data_names or _has_map_file(data_names, ".rvdata")
+    if has_rgss2 or has_rgssad or has_vx_maps:
         archive_path: Path | None = None
-        if rgss2_archive.exists():
+        if has_rgss2:
             archive_path = rgss2_archive.resolve()
-        elif rgssad_archive.exists():
+        elif has_rgssad:
             archive_path = rgssad_archive.resolve()
         return GameDiscoveryResult(engine="vx", data_dir=data_dir.resolve(), archive_path=archive_path)
 
@@ -3,25 +3,134 @@
 from __future__ import annotations
 
 import json
+import mmap
+import os
 import shutil
+import sys
+import time
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+try:  # 可选加速：装了 orjson 就用，没有则使用标准库
+    import orjson
+except ImportError:
+    orjson = None
+
 from .errors import InvalidRequestError, NotFoundError
 
 REGISTRY_VERSION = 1
 
 _UNSET = object()
+_VALID_ENGINES = frozenset(("mv", "vx", "vxace"))
+# 可用性检测的标记文件（normcase 后，与 _list_names 的结果比较）
+_VX_DATA_MARKERS = frozenset(map(os.path.normcase, ("MapInfos.rvdata2", "MapInfos.rvdata")))
+_VXACE_ARCHIVES = frozenset((os.path.normcase("Game.rgss3a"),))
+_VX_ARCHIVES = frozenset(map(os.path.normcase, ("Game.rgss2a", "Game.rgssad")))
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+_APPEND_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0)
+# 增量日志超过这么多行就整体重写一次快照并清空日志
+_LOG_COMPACT_LINES = 100
+# 刚改动过的目录不缓存可用性：mtime 精度较粗的文件系统上，同一时间戳内可能还有文件增删
+_AVAILABILITY_SETTLE_NS = 2_000_000_000
+
+
+def _dumps(data: dict[str, Any], indent: bool = False) -> bytes:
+    # 日常保存用紧凑格式（体积约减半）；indent=True 输出便于阅读的缩进版本
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _dump_line(data: dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data) + b"\n"
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _loads(raw: bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except ValueError:
+            # orjson 不接受 BOM 等输入，交回标准库（真坏文件也由它报错）
+            pass
+    return json.loads(raw)
+
+
+def _load_file(path: str) -> Any:
+    with open(path, "rb") as f:
+        if orjson is not None:
+            # orjson 直接解析映射的内存，省掉一次整文件拷贝
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # 空文件等无法映射的情况走普通读取
+                return _loads(f.read())
+            with mm:
+                with memoryview(mm) as view:
+                    try:
+                        return orjson.loads(view)
+                    except ValueError:
+                        pass
+                # orjson 不接受 BOM 等输入，交回标准库（真坏文件也由它报错）
+                return json.loads(mm[:])
+        return _loads(f.read())
+
+
+def _list_names(directory: str) -> frozenset[str]:
+    try:
+        with os.scandir(directory) as it:
+            return frozenset(os.path.normcase(entry.name) for entry in it)
+    except OSError:
+        return frozenset()
+
+
+def _dir_mtime_ns(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _paths_available(engine: str, exe_path: str, data_path: str) -> bool:
+    if engine == "mv":
+        # 只查一个文件，单次 stat 比列目录便宜
+        return os.path.exists(os.path.join(data_path, "MapInfos.json"))
+
+    # VX/VX Ace 要查多个候选文件：data 目录、游戏根目录各列一次，用集合判断
+    if not _VX_DATA_MARKERS.isdisjoint(_list_names(data_path)):
+        return True
+    archives = _VXACE_ARCHIVES if engine == "vxace" else _VX_ARCHIVES
+    return not archives.isdisjoint(_list_names(os.path.dirname(exe_path)))
+
+
+# (整秒时间戳, 对应的 ISO 文本)：同一秒内的多次修改复用同一个字符串
+_now_iso_cache: tuple[int, str] = (0, "")
+
+
+def _normalize_engine(value: Any) -> str:
+    # 驻留后 engine 与字面量 "mv" 等比较时先走指针相等的快速路径
+    engine = str(value or "mv").strip().lower()
+    return sys.intern(engine) if engine in _VALID_ENGINES else "mv"
 
 
 def _now_iso() -> str:
-    return datetime.now().isoformat(timespec="seconds")
+    global _now_iso_cache
+    now = int(time.time())
+    cached_sec, cached_text = _now_iso_cache
+    if now == cached_sec:
+        return cached_text
+    text = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(now))
+    _now_iso_cache = (now, text)
+    return text
 
 
-@dataclass
+@dataclass(slots=True)
 class GameEntry:
     id: str
     name: str
@@ -34,18 +143,17 @@ class GameEntry:
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "GameEntry":
-        engine = str(data.get("engine", "mv") or "mv").strip().lower()
-        if engine not in ("mv", "vx", "vxace"):
-            engine = "mv"
+        get = data.get
+        # 按字段顺序位置传参，省去关键字参数的匹配
         return cls(
-            id=str(data.get("id", "")),
-            name=str(data.get("name", "")).strip(),
-            cover_image=str(data.get("cover_image", "") or "").strip(),
-            exe_path=str(data.get("exe_path", "")).strip(),
-            data_path=str(data.get("data_path", "")).strip(),
-            engine=engine,
-            added_at=str(data.get("added_at", "") or ""),
-            updated_at=str(data.get("updated_at", "") or ""),
+            sys.intern(str(get("id", ""))),
+            str(get("name", "")).strip(),
+            str(get("cover_image", "") or "").strip(),
+            str(get("exe_path", "")).strip(),
+            str(get("data_path", "")).strip(),
+            _normalize_engine(get("engine")),
+            str(get("added_at", "") or ""),
+            str(get("updated_at", "") or ""),
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -61,55 +169,271 @@ class GameEntry:
         }
 
     def is_available(self) -> bool:
-        if self.engine == "mv":
-            return (Path(self.data_path) / "MapInfos.json").exists()
-
-        data_dir = Path(self.data_path)
-        if (data_dir / "MapInfos.rvdata2").exists() or (data_dir / "MapInfos.rvdata").exists():
-            return True
-
-        root = Path(self.exe_path).parent
-        if self.engine == "vxace" and (root / "Game.rgss3a").exists():
-            return True
-        if self.engine == "vx" and ((root / "Game.rgss2a").exists() or (root / "Game.rgssad").exists()):
-            return True
+        return _paths_available(self.engine, self.exe_path, self.data_path)
+
+
+_ENTRY_FIELDS = frozenset(f.name for f in fields(GameEntry))
+# 必须非空的字段，以及 from_dict 会去掉首尾空白的字段
+_REQUIRED_FIELDS = ("id", "name", "exe_path", "data_path", "added_at", "updated_at")
+_STRIPPED_FIELDS = ("name", "cover_image", "exe_path", "data_path")
+
+
+def _is_normalized_row(item: dict[str, Any]) -> bool:
+    """行已是 to_dict() 的规范形状（本程序写出的文件都是）时，可以原样沿用，不必经 GameEntry 往返。"""
+    if item.keys() != _ENTRY_FIELDS:
+        return False
+    for value in item.values():
+        if type(value) is not str:
+            return False
+    for key in _REQUIRED_FIELDS:
+        if not item[key]:
+            return False
+    for key in _STRIPPED_FIELDS:
+        value = item[key]
+        if value != value.strip():
+            return False
+    return item["engine"] in _VALID_ENGINES
+
+
+def _intern_row(row: dict[str, Any]) -> None:
+    # id 与 active_game_id 都驻留后，as_payload 等处的 id 比较先走指针相等的快速路径
+    row["id"] = sys.intern(row["id"])
+    row["engine"] = sys.intern(row["engine"])
+
+
+def _apply_delta(data: dict[str, Any], delta: Any) -> bool:
+    """把一条增量（active / put / delete）应用到注册表数据上；格式不对时返回 False。"""
+    if not isinstance(delta, dict):
         return False
+    op = delta.get("op")
+    games = data["games"]
+    if op == "active":
+        game_id = delta.get("id")
+        if not isinstance(game_id, str):
+            return False
+        if not game_id or any(g["id"] == game_id for g in games):
+            data["active_game_id"] = sys.intern(game_id)
+        return True
+    if op == "put":
+        row = delta.get("game")
+        if not isinstance(row, dict) or not _is_normalized_row(row):
+            return False
+        _intern_row(row)
+        for i, g in enumerate(games):
+            if g["id"] == row["id"]:
+                games[i] = row
+                break
+        return True
+    if op == "delete":
+        game_id = delta.get("id")
+        if not isinstance(game_id, str):
+            return False
+        remaining = [g for g in games if g["id"] != game_id]
+        data["games"] = remaining
+        if data.get("active_game_id") == game_id:
+            data["active_game_id"] = remaining[0]["id"] if remaining else ""
+        return True
+    return False
 
 
 class GameRegistry:
-    """Read/write helper around games_registry.json."""
+    """Read/write helper around games_registry.json.
 
-    def __init__(self, registry_path: str | Path):
+    persist=False keeps the registry in memory only (reads the file if present, never writes it).
+    Use ``with registry:`` to batch several mutations into a single write.
+
+    Small edits (active game, rename/cover, delete) are appended to ``<name>.log.jsonl`` instead of
+    rewriting the whole file; the log is replayed on load and folded back into the snapshot on the
+    next full write or once it grows past ``_LOG_COMPACT_LINES`` lines.
+    """
+
+    def __init__(self, registry_path: str | Path, persist: bool = True):
         self.path = Path(registry_path).resolve()
+        self.persist = persist
+        self._path_str = str(self.path)
+        self._tmp_path = self._path_str + ".tmp"
+        self._log_path = str(self.path.with_suffix(".log.jsonl"))
+        # 增量日志当前行数（不含首行）；磁盘上快照的 generation（尚未落盘时为 None）
+        self._log_lines = 0
+        self._snapshot_generation: int | None = None
         self.last_warning: str = ""
+        # _dirty: 内存中有未落盘的修改；_batching > 0 时修改只记脏，退出最外层 with 时统一写一次
+        self._dirty = False
+        self._batching = 0
+        # 游戏 id -> (相关目录 mtime, 可用性)
+        self._availability_cache: dict[str, tuple[tuple[int | None, ...], bool]] = {}
         self._data = self._load_or_init()
 
+    def __enter__(self) -> "GameRegistry":
+        self._batching += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._batching -= 1
+        if not self._batching:
+            self.flush()
+
+    def flush(self) -> None:
+        """把未落盘的修改写入文件（没有修改时什么也不做）。"""
+        if self._dirty:
+            self._write()
+
+    def export(self, path: str | Path) -> None:
+        """把当前注册表以缩进格式写到 path，供备份或手工查看。"""
+        Path(path).write_bytes(_dumps(self._data, indent=True))
+
     def _empty_data(self) -> dict[str, Any]:
         return {
             "version": REGISTRY_VERSION,
+            # 每次整体写入加一；增量日志首行记下它所基于的 generation
+            "generation": 0,
             "active_game_id": "",
             "games": [],
         }
 
-    def _save(self) -> None:
+    def _reindex(self) -> None:
+        # id、exe/data 路径 -> 在 games 列表中首次出现的位置；每次变更后（_save 内）重建
+        id_index: dict[str, int] = {}
+        path_index: dict[str, int] = {}
+        for i, raw in enumerate(self._data.get("games", [])):
+            id_index.setdefault(raw["id"], i)
+            path_index.setdefault(raw["exe_path"], i)
+            path_index.setdefault(raw["data_path"], i)
+        self._id_index = id_index
+        self._path_index = path_index
+        self._entries = None
+
+    def _cached_entries(self) -> list[GameEntry]:
+        entries = self._entries
+        if entries is None:
+            # 内存里的行都已经过 _normalize_data / to_dict 规范化，直接按字段构造，不再逐项 strip/校验
+            entries = self._entries = [GameEntry(**raw) for raw in self._data["games"]]
+        return entries
+
+    def _entry_at(self, index: int) -> GameEntry:
+        # 已有整表缓存就直接取；否则只构造这一项，不为取一个游戏物化整张列表
+        entries = self._entries
+        if entries is not None:
+            return entries[index]
+        return GameEntry(**self._data["games"][index])
+
+    def _save(self, delta: dict[str, Any] | None = None) -> None:
+        self._reindex()
+        # 批量修改中、或已有未落盘修改时，增量不单独记日志，交给整体写入
+        if delta is not None and not self._batching and not self._dirty:
+            self._append_log(delta)
+            return
+        self._dirty = True
+        if not self._batching:
+            self._write()
+
+    def _commit(self, delta: dict[str, Any]) -> None:
+        # 应用失败的增量绝不能进日志：重放时会停在这一行，之后的修改全部丢失
+        if not _apply_delta(self._data, delta):
+            raise ValueError(f"invalid registry delta: {delta!r}")
+        self._save(delta)
+
+    def _append_log(self, delta: dict[str, Any]) -> None:
+        if not self.persist:
+            return
+        if self._log_lines >= _LOG_COMPACT_LINES or self._snapshot_generation is None:
+            self._write()
+            return
+        line = _dump_line(delta)
+        if not self._log_lines:
+            # 新日志：首行记下快照的 generation，重放时据此判断日志是否接在这份快照之后
+            line = _dump_line({"base": self._snapshot_generation}) + line
+        fd = os.open(self._log_path, _APPEND_FLAGS, 0o644)
+        try:
+            os.write(fd, line)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self._log_lines += 1
+
+    def _replay_log(self, data: dict[str, Any]) -> int:
+        """把与当前快照匹配的增量日志应用到 data 上，返回成功应用的条数。"""
+        try:
+            with open(self._log_path, "rb") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return 0
+        if not lines:
+            return 0
+        pending = len(lines) - 1
+        try:
+            header = _loads(lines[0])
+        except ValueError:
+            header = None
+        base = header.get("base") if isinstance(header, dict) else None
+        generation = data["generation"]
+        if type(base) is int and base < generation:
+            # 整体重写后、删除日志前中断留下的旧日志：其中的修改已经包含在快照里
+            return 0
+        if base != generation:
+            if pending:
+                self.last_warning = (
+                    f"游戏库增量日志与游戏库文件不匹配（可能是还原了旧的备份），已忽略其中 {pending} 条修改"
+                )
+            return 0
+        applied = 0
+        for i, line in enumerate(lines[1:], 1):
+            try:
+                delta = _loads(line)
+            except ValueError:
+                delta = None
+                # 最后一行是追加到一半时断电留下的残行，属正常情况
+                if i == len(lines) - 1:
+                    break
+            if not _apply_delta(data, delta):
+                self.last_warning = f"游戏库增量日志第 {i} 行无效，已忽略其后 {pending - applied} 条修改"
+                break
+            applied += 1
+        return applied
+
+    def _write(self) -> None:
+        self._dirty = False
+        if not self.persist:
+            return
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
-        with tmp_path.open("w", encoding="utf-8") as f:
-            json.dump(self._data, f, ensure_ascii=False, indent=2)
-        tmp_path.replace(self.path)
+        generation = self._data["generation"] + 1
+        self._data["generation"] = generation
+        payload = memoryview(_dumps(self._data))
+        fd = os.open(self._tmp_path, _WRITE_FLAGS, 0o644)
+        try:
+            while payload:
+                payload = payload[os.write(fd, payload):]
+            # 先确保临时文件落盘再替换，断电时不会留下截断的注册表
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(self._tmp_path, self._path_str)
+        self._snapshot_generation = generation
+        # 快照已包含全部修改，增量日志作废
+        self._log_lines = 0
+        try:
+            os.unlink(self._log_path)
+        except FileNotFoundError:
+            pass
 
     def _normalize_data(self, raw: dict[str, Any]) -> dict[str, Any]:
         out = self._empty_data()
         if isinstance(raw.get("version"), int):
             out["version"] = raw["version"]
+        if type(raw.get("generation")) is int:
+            out["generation"] = raw["generation"]
         active_id = raw.get("active_game_id", "")
-        out["active_game_id"] = str(active_id) if active_id is not None else ""
+        out["active_game_id"] = sys.intern(str(active_id)) if active_id is not None else ""
 
         games: list[dict[str, Any]] = []
         if isinstance(raw.get("games"), list):
             for item in raw["games"]:
                 if not isinstance(item, dict):
                     continue
+                if _is_normalized_row(item):
+                    _intern_row(item)
+                    games.append(item)
+                    continue
                 entry = GameEntry.from_dict(item)
                 if not entry.id or not entry.exe_path or not entry.data_path:
                     continue
@@ -134,13 +458,19 @@ class GameRegistry:
             return data
 
         try:
-            with self.path.open("r", encoding="utf-8") as f:
-                raw = json.load(f)
+            raw = _load_file(self._path_str)
             if not isinstance(raw, dict):
                 raise ValueError("registry root is not object")
             data = self._normalize_data(raw)
+            self._snapshot_generation = data["generation"]
+            # 文件已是规范形状且没有增量日志时不必重写：只读启动不产生写盘和 fsync
+            needs_write = data != raw or os.path.exists(self._log_path)
+            self._replay_log(data)
             self._data = data
-            self._save()
+            if needs_write:
+                self._save()
+            else:
+                self._reindex()
             return data
         except Exception as exc:  # noqa: BLE001
             ts = datetime.now().strftime("%Y%m%d-%H%M%S")
@@ -158,13 +488,30 @@ class GameRegistry:
             return data
 
     def list_games(self) -> list[GameEntry]:
-        return [GameEntry.from_dict(x) for x in self._data.get("games", [])]
+        return list(self._cached_entries())
 
     def get_game(self, game_id: str) -> GameEntry:
-        for entry in self.list_games():
-            if entry.id == game_id:
-                return entry
-        raise NotFoundError(f"游戏不存在: {game_id}")
+        index = self._id_index.get(game_id)
+        if index is None:
+            raise NotFoundError(f"游戏不存在: {game_id}")
+        return self._entry_at(index)
+
+    def _find_index(self, exe_path: str, data_path: str) -> int | None:
+        # exe 或 data 路径命中的最靠前一行（两次字典查找，不扫描列表）
+        by_exe = self._path_index.get(exe_path)
+        by_data = self._path_index.get(data_path)
+        if by_exe is None:
+            return by_data
+        if by_data is None:
+            return by_exe
+        return min(by_exe, by_data)
+
+    def find_by_exe_or_data(self, exe_path: str, data_path: str) -> GameEntry | None:
+        """按已规范化的 exe/data 路径查找游戏，返回列表中最先匹配的一项。"""
+        index = self._find_index(exe_path, data_path)
+        if index is None:
+            return None
+        return self._entry_at(index)
 
     def get_active_game_id(self) -> str:
         return str(self._data.get("active_game_id", "") or "")
@@ -180,13 +527,11 @@ class GameRegistry:
 
     def set_active_game(self, game_id: str) -> GameEntry:
         game = self.get_game(game_id)
-        self._data["active_game_id"] = game.id
-        self._save()
+        self._commit({"op": "active", "id": game.id})
         return game
 
     def clear_active_game(self) -> None:
-        self._data["active_game_id"] = ""
-        self._save()
+        self._commit({"op": "active", "id": ""})
 
     def upsert_game(
         self,
@@ -194,31 +539,37 @@ class GameRegistry:
         data_path: str | Path,
         name: str | None = None,
         engine: str = "mv",
+        *,
+        resolved: bool = False,
     ) -> GameEntry:
-        exe = str(Path(exe_path).expanduser().resolve())
-        data = str(Path(data_path).expanduser().resolve())
-        normalized_engine = (engine or "mv").strip().lower()
-        if normalized_engine not in ("mv", "vx", "vxace"):
-            normalized_engine = "mv"
+        """新增或更新游戏；resolved=True 表示调用方给的已是 resolve() 过的绝对路径，不再访问文件系统。"""
+        if resolved:
+            exe = str(exe_path)
+            data = str(data_path)
+        else:
+            exe = str(Path(exe_path).expanduser().resolve())
+            data = str(Path(data_path).expanduser().resolve())
+        normalized_engine = _normalize_engine(engine)
         now = _now_iso()
 
-        for i, raw in enumerate(self._data["games"]):
-            if raw["exe_path"] == exe or raw["data_path"] == data:
-                existing = GameEntry.from_dict(raw)
-                existing.exe_path = exe
-                existing.data_path = data
-                existing.engine = normalized_engine
-                existing.updated_at = now
-                if name and name.strip():
-                    existing.name = name.strip()
-                self._data["games"][i] = existing.to_dict()
-                if not self._data.get("active_game_id"):
-                    self._data["active_game_id"] = existing.id
-                self._save()
-                return existing
+        index = self._find_index(exe, data)
+        if index is not None:
+            existing = GameEntry.from_dict(self._data["games"][index])
+            existing.exe_path = exe
+            existing.data_path = data
+            existing.engine = normalized_engine
+            existing.updated_at = now
+            self._availability_cache.pop(existing.id, None)
+            if name and name.strip():
+                existing.name = name.strip()
+            self._data["games"][index] = existing.to_dict()
+            if not self._data.get("active_game_id"):
+                self._data["active_game_id"] = existing.id
+            self._save()
+            return existing
 
         entry = GameEntry(
-            id=str(uuid.uuid4()),
+            id=sys.intern(str(uuid.uuid4())),
             name=(name.strip() if name and name.strip() else Path(exe).stem or "未命名游戏"),
             cover_image="",
             exe_path=exe,
@@ -234,45 +585,50 @@ class GameRegistry:
         return entry
 
     def update_game(self, game_id: str, *, name: str | None = None, cover_image: Any = _UNSET) -> GameEntry:
-        games = self._data.get("games", [])
-        for i, raw in enumerate(games):
-            if raw.get("id") != game_id:
-                continue
-            entry = GameEntry.from_dict(raw)
-            if name is not None:
-                name_val = name.strip()
-                if not name_val:
-                    raise InvalidRequestError("游戏名称不能为空")
-                entry.name = name_val
-            if cover_image is not _UNSET:
-                entry.cover_image = str(cover_image or "").strip()
-            entry.updated_at = _now_iso()
-            games[i] = entry.to_dict()
-            self._save()
-            return entry
-        raise NotFoundError(f"游戏不存在: {game_id}")
+        index = self._id_index.get(game_id)
+        if index is None:
+            raise NotFoundError(f"游戏不存在: {game_id}")
+        entry = GameEntry.from_dict(self._data["games"][index])
+        if name is not None:
+            name_val = name.strip()
+            if not name_val:
+                raise InvalidRequestError("游戏名称不能为空")
+            entry.name = name_val
+        if cover_image is not _UNSET:
+            entry.cover_image = str(cover_image or "").strip()
+        entry.updated_at = _now_iso()
+        self._commit({"op": "put", "game": entry.to_dict()})
+        return entry
 
     def delete_game(self, game_id: str) -> None:
-        games = self._data.get("games", [])
-        new_games = [g for g in games if g.get("id") != game_id]
-        if len(new_games) == len(games):
+        if game_id not in self._id_index:
             raise NotFoundError(f"游戏不存在: {game_id}")
-        self._data["games"] = new_games
-        if self._data.get("active_game_id") == game_id:
-            self._data["active_game_id"] = new_games[0]["id"] if new_games else ""
-        self._save()
+        self._availability_cache.pop(game_id, None)
+        self._commit({"op": "delete", "id": game_id})
+
+    def _is_available(self, row: dict[str, Any]) -> bool:
+        # MV 只需一次 stat，直接检测；VX/VX Ace 最多要查 4 个文件，按 data/根目录的 mtime 缓存结果
+        engine, exe_path, data_path = row["engine"], row["exe_path"], row["data_path"]
+        if engine == "mv":
+            return _paths_available(engine, exe_path, data_path)
+        key = (_dir_mtime_ns(data_path), _dir_mtime_ns(os.path.dirname(exe_path)))
+        cached = self._availability_cache.get(row["id"])
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        available = _paths_available(engine, exe_path, data_path)
+        now_ns = time.time_ns()
+        if all(m is not None and now_ns - m > _AVAILABILITY_SETTLE_NS for m in key):
+            self._availability_cache[row["id"]] = (key, available)
+        return available
 
     def as_payload(self) -> dict[str, Any]:
         active_id = self.get_active_game_id()
-        games = []
-        for game in self.list_games():
-            games.append(
-                {
-                    **game.to_dict(),
-                    "is_active": game.id == active_id,
-                    "is_available": game.is_available(),
-                }
-            )
+        is_available = self._is_available
+        # 直接展开内存中的行字典，每行只分配一个新字典，不经过 GameEntry
+        games = [
+            {**raw, "is_active": raw["id"] == active_id, "is_available": is_available(raw)}
+            for raw in self._data["games"]
+        ]
         return {
             "version": self._data.get("version", REGISTRY_VERSION),
             "active_game_id": active_id,
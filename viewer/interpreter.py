@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
+
 from .database import DatabaseManager
 
+_PAGE_CACHE_SIZE = 4096
+
+
 class EventInterpreter:
     """将 RPG Maker MV 事件指令翻译为人类可读的结构化数据"""
 
@@ -13,6 +19,9 @@ class EventInterpreter:
         self.current_map_name = None
         self.current_encounters = None
         self.current_encounter_step = None
+        self._page_cache: OrderedDict = OrderedDict()
+        # 地图上下文与页缓存是可变状态，多线程服务时需持锁访问。
+        self.lock = threading.RLock()
 
     def _classify_event(self, evt):
         """根据事件所有页的指令码自动判定事件类型"""
@@ -60,9 +69,26 @@ class EventInterpreter:
         for i, page in enumerate(pages):
             if page is None:
                 continue
-            result["pages"].append(self._interpret_page(page, i))
+            result["pages"].append(self._interpret_page_cached(page, i, eid))
         return result
 
+    def _interpret_page_cached(self, page_data, page_index, event_id):
+        """地图上下文内按 (地图, 事件, 页) 缓存解析结果"""
+        if self.current_map_id is None:
+            return self._interpret_page(page_data, page_index)
+        key = (self.current_map_id, event_id, page_index)
+        cached = self._page_cache.get(key)
+        # 缓存项同时持有原始页对象：地图文件改动后加载器会重新解析出新对象，身份不同即视为失效
+        if cached is not None and cached[0] is page_data:
+            self._page_cache.move_to_end(key)
+            return cached[1]
+        parsed = self._interpret_page(page_data, page_index)
+        self._page_cache[key] = (page_data, parsed)
+        self._page_cache.move_to_end(key)
+        if len(self._page_cache) > _PAGE_CACHE_SIZE:
+            self._page_cache.popitem(last=False)
+        return parsed
+
     def _interpret_page(self, page_data, page_index):
         """解析单个事件页"""
         trigger_map = {0: "确定键", 1: "玩家接触", 2: "事件接触",
@@ -113,34 +139,35 @@ class EventInterpreter:
     def _parse_page_visual(image_data, face_name, face_index):
         if not isinstance(image_data, dict):
             image_data = {}
+        get = image_data.get
         character_name = str(
-            image_data.get("characterName")
-            or image_data.get("character_name")
+            get("characterName")
+            or get("character_name")
             or ""
         ).strip()
-        raw_index = image_data.get("characterIndex", image_data.get("character_index", 0))
+        raw_index = get("characterIndex", get("character_index", 0))
         try:
             character_index = int(raw_index)
         except Exception:  # noqa: BLE001
             character_index = 0
-        is_big = bool(image_data.get("isBigCharacter", False))
+        is_big = bool(get("isBigCharacter", False))
         if character_name and character_name.startswith("$"):
             is_big = True
 
-        out_face_name = str(face_name or image_data.get("faceName") or image_data.get("face_name") or "").strip()
+        out_face_name = str(face_name or get("faceName") or get("face_name") or "").strip()
         if out_face_name:
-            out_face_index = int(face_index or image_data.get("faceIndex") or image_data.get("face_index") or 0)
+            out_face_index = int(face_index or get("faceIndex") or get("face_index") or 0)
         else:
             out_face_index = 0
 
         if not character_name and not out_face_name:
             return {}
         try:
-            direction = int(image_data.get("direction", image_data.get("characterDirection", 2)) or 2)
+            direction = int(get("direction", get("characterDirection", 2)) or 2)
         except Exception:  # noqa: BLE001
             direction = 2
         try:
-            pattern = int(image_data.get("pattern", image_data.get("characterPattern", 1)) or 1)
+            pattern = int(get("pattern", get("characterPattern", 1)) or 1)
         except Exception:  # noqa: BLE001
             pattern = 1
         return {
@@ -193,6 +220,8 @@ class EventInterpreter:
                 line = {"indent": indent, "text": text, "cls": css_cls}
                 if refs:
                     line["refs"] = refs
+                if code == 117:
+                    line["ceId"] = params[0] if params else 0
                 lines.append(line)
         return lines
 
@@ -5,6 +5,7 @@ from __future__ import annotations
 import os
 import subprocess
 from pathlib import Path
+from typing import Any, Callable
 
 
 def find_java_decrypter_jar(project_root: str | Path) -> Path | None:
@@ -34,7 +35,13 @@ def find_java_decrypter_jar(project_root: str | Path) -> Path | None:
     return pool[0]
 
 
-def run_java_decrypt(game_root: str | Path, output_dir: str | Path, jar_path: str | Path | None) -> tuple[bool, str]:
+def run_java_decrypt(
+    game_root: str | Path,
+    output_dir: str | Path,
+    jar_path: str | Path | None,
+    *,
+    runner: Callable[..., Any] = subprocess.run,
+) -> tuple[bool, str]:
     if not jar_path:
         return False, "检测到资源封包但无法解包（缺少 Java Decrypter JAR）"
 
@@ -59,7 +66,7 @@ def run_java_decrypt(game_root: str | Path, output_dir: str | Path, jar_path: st
     ]
 
     try:
-        proc = subprocess.run(  # noqa: S603
+        proc = runner(  # noqa: S603
             cmd,
             capture_output=True,
             text=True,
@@ -59,7 +59,7 @@ def scan_encrypted_resources(game_root: str | Path) -> list[Path]:
 def load_encryption_key(system_json_path: str | Path) -> str | None:
     path = Path(system_json_path).expanduser().resolve()
     try:
-        raw = json.loads(path.read_text(encoding="utf-8"))
+        raw = json.loads(path.read_bytes())
     except Exception:  # noqa: BLE001
         return None
 
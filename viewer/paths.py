@@ -10,4 +10,5 @@ PACKAGE_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = PACKAGE_DIR.parent
 STATIC_DIR = PACKAGE_DIR / "static"
 REGISTRY_PATH = PROJECT_ROOT / "games_registry.json"
+PARSED_JSON_CACHE_DIR = PROJECT_ROOT / ".cache" / "parsed_json"
 
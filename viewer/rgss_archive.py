@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import struct
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -10,12 +11,17 @@ from .errors import GameDataInvalidError
 
 _RGSS_MAGIC = b"RGSSAD"
 _KEY_MASK = 0xFFFFFFFF
+_LITTLE_ENDIAN = sys.byteorder == "little"
 
 
 def _u32(value: int) -> int:
     return value & _KEY_MASK
 
 
+def _bswap32(value: int) -> int:
+    return int.from_bytes(value.to_bytes(4, "little"), "big")
+
+
 def _canonical(path: str) -> str:
     return path.replace("/", "\\").strip().lower()
 
@@ -129,21 +135,22 @@ class RgssArchive:
             f.seek(size, 1)
 
     def _read_and_decrypt(self, entry: RgssArchiveEntry) -> bytes:
+        # 直接读进预分配的缓冲区再原地解密，避免 read() 的 bytes 再拷贝成 bytearray
+        data = bytearray(entry.size)
         with self.path.open("rb") as f:
             f.seek(entry.offset)
-            data = bytearray(f.read(entry.size))
-        if len(data) != entry.size:
+            read = f.readinto(data)
+        if read != entry.size:
             raise GameDataInvalidError(f"归档数据读取失败: {entry.name}")
 
         data_key = entry.data_key
         groups = entry.size // 4
-        for i in range(groups):
-            base = i * 4
-            data[base] ^= (data_key >> 0) & 0xFF
-            data[base + 1] ^= (data_key >> 8) & 0xFF
-            data[base + 2] ^= (data_key >> 16) & 0xFF
-            data[base + 3] ^= (data_key >> 24) & 0xFF
-            data_key = _u32(data_key * 7 + 3)
+        if groups:
+            # 密钥按小端 32 位整字异或：用 uint32 视图逐字处理，循环次数只有逐字节的四分之一
+            with memoryview(data)[: groups * 4].cast("I") as words:
+                for i in range(groups):
+                    words[i] ^= data_key if _LITTLE_ENDIAN else _bswap32(data_key)
+                    data_key = _u32(data_key * 7 + 3)
 
         pos = groups * 4
         while pos < entry.size:
@@ -152,4 +159,3 @@ class RgssArchive:
             pos += 1
 
         return bytes(data)
-
@@ -6,7 +6,7 @@ import json
 import mimetypes
 import threading
 import webbrowser
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from urllib.parse import parse_qs, urlparse
 
@@ -26,18 +26,21 @@ from .paths import PORT, STATIC_DIR
 
 
 class ViewerRequestHandler(BaseHTTPRequestHandler):
-    app_state: AppState | None = None
+    # 所有响应都带 Content-Length，可以安全地保持连接复用
+    protocol_version = "HTTP/1.1"
 
     def log_message(self, format, *args):  # noqa: A003
         pass
 
-    def _send_json(self, data, status: int = 200):
+    def _send_json(self, data, status: int = 200, close: bool = False):
         body = json.dumps(data, ensure_ascii=False).encode("utf-8")
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Cache-Control", "no-store, no-cache, must-revalidate, max-age=0")
         self.send_header("Pragma", "no-cache")
         self.send_header("Content-Length", str(len(body)))
+        if close:
+            self.send_header("Connection", "close")
         self.end_headers()
         self.wfile.write(body)
 
@@ -60,8 +63,15 @@ class ViewerRequestHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(body)
 
+    # 出错时请求体可能没读完，关闭连接以免残留数据串到下一个请求
+    def _send_not_found(self):
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
     def _send_error_json(self, message: str, status: int = 400):
-        self._send_json({"error": message}, status=status)
+        self._send_json({"error": message}, status=status, close=True)
 
     def _read_json_body(self):
         length = int(self.headers.get("Content-Length", "0") or "0")
@@ -77,9 +87,10 @@ class ViewerRequestHandler(BaseHTTPRequestHandler):
         return data
 
     def _get_state(self) -> AppState:
-        if self.app_state is None:
+        state = getattr(self.server, "app_state", None)
+        if state is None:
             raise RuntimeError("AppState 未初始化")
-        return self.app_state
+        return state
 
     def _get_context(self):
         state = self._get_state()
@@ -88,8 +99,7 @@ class ViewerRequestHandler(BaseHTTPRequestHandler):
     def _serve_static(self, rel_path: str):
         file_path = (STATIC_DIR / rel_path).resolve()
         if not str(file_path).startswith(str(STATIC_DIR.resolve())) or not file_path.exists() or not file_path.is_file():
-            self.send_response(404)
-            self.end_headers()
+            self._send_not_found()
             return
         mime = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
         self._send_bytes(file_path.read_bytes(), content_type=mime)
@@ -176,8 +186,7 @@ class ViewerRequestHandler(BaseHTTPRequestHandler):
                 self._handle_export(map_id=map_id)
                 return
 
-            self.send_response(404)
-            self.end_headers()
+            self._send_not_found()
         except NoActiveGameError as exc:
             self._send_error_json(str(exc), status=400)
         except (InvalidRequestError, NotFoundError, GameDataInvalidError) as exc:
@@ -200,8 +209,7 @@ class ViewerRequestHandler(BaseHTTPRequestHandler):
             if path == "/api/games/select":
                 self._handle_games_select()
                 return
-            self.send_response(404)
-            self.end_headers()
+            self._send_not_found()
         except (InvalidRequestError, NotFoundError, GameDataInvalidError) as exc:
             self._send_error_json(str(exc), status=400)
         except Exception as exc:  # noqa: BLE001
@@ -223,8 +231,7 @@ class ViewerRequestHandler(BaseHTTPRequestHandler):
                 entry = state.update_game(game_id, name=name, cover_image=cover_image, cover_provided=cover_provided)
                 self._send_json({"ok": True, "game": entry.to_dict()})
                 return
-            self.send_response(404)
-            self.end_headers()
+            self._send_not_found()
         except (InvalidRequestError, NotFoundError) as exc:
             self._send_error_json(str(exc), status=400)
         except Exception as exc:  # noqa: BLE001
@@ -242,8 +249,7 @@ class ViewerRequestHandler(BaseHTTPRequestHandler):
                 state.delete_game(game_id)
                 self._send_json({"ok": True})
                 return
-            self.send_response(404)
-            self.end_headers()
+            self._send_not_found()
         except (InvalidRequestError, NotFoundError) as exc:
             self._send_error_json(str(exc), status=400)
         except Exception as exc:  # noqa: BLE001
@@ -304,15 +310,13 @@ class ViewerRequestHandler(BaseHTTPRequestHandler):
     def _handle_cover(self, parsed):
         path_q = parse_qs(parsed.query).get("path", [""])[0].strip()
         if not path_q:
-            self.send_response(404)
-            self.end_headers()
+            self._send_not_found()
             return
         local = Path(path_q).expanduser()
         if not local.is_absolute():
             local = local.resolve()
         if not local.exists() or not local.is_file():
-            self.send_response(404)
-            self.end_headers()
+            self._send_not_found()
             return
         mime = mimetypes.guess_type(local.name)[0] or "application/octet-stream"
         self._send_bytes(local.read_bytes(), content_type=mime)
@@ -340,11 +344,14 @@ class ViewerRequestHandler(BaseHTTPRequestHandler):
         }
 
         events = map_data.get("events", [])
-        ctx.interpreter.set_map_context(map_id, result["name"], map_data)
-        for evt in events:
-            if evt is not None and isinstance(evt, dict):
-                result["events"].append(ctx.interpreter.interpret_event(evt))
-        ctx.interpreter.clear_map_context()
+        with ctx.interpreter.lock:
+            ctx.interpreter.set_map_context(map_id, result["name"], map_data)
+            try:
+                for evt in events:
+                    if evt is not None and isinstance(evt, dict):
+                        result["events"].append(ctx.interpreter.interpret_event(evt))
+            finally:
+                ctx.interpreter.clear_map_context()
 
         normalized_engine = str(ctx.game.engine or "").lower()
         if normalized_engine in ("mv", "mz", "vx", "vxace"):
@@ -378,7 +385,8 @@ class ViewerRequestHandler(BaseHTTPRequestHandler):
             for evt in events:
                 if evt is None or not isinstance(evt, dict):
                     continue
-                parsed = ctx.interpreter.interpret_event(evt)
+                with ctx.interpreter.lock:
+                    parsed = ctx.interpreter.interpret_event(evt)
                 matches = []
                 for pg in parsed["pages"]:
                     for cmd in pg["commands"]:
@@ -407,7 +415,8 @@ class ViewerRequestHandler(BaseHTTPRequestHandler):
             return
         trigger_map = {0: "无", 1: "自动执行", 2: "并行处理"}
         raw_list = ce.get("list", [])
-        commands = ctx.interpreter._interpret_commands(raw_list)
+        with ctx.interpreter.lock:
+            commands = ctx.interpreter._interpret_commands(raw_list)
         if ctx.interpreter._is_story_page(raw_list):
             for cmd in commands:
                 if cmd.get("cls") == "cmd-battle":
@@ -458,8 +467,7 @@ class ViewerRequestHandler(BaseHTTPRequestHandler):
         resolver = AssetResolver(ctx.game)
         local = resolver.resolve_rel_asset(rel_path)
         if not local:
-            self.send_response(404)
-            self.end_headers()
+            self._send_not_found()
             return
         mime = mimetypes.guess_type(local.name)[0] or "application/octet-stream"
         self._send_bytes(local.read_bytes(), content_type=mime)
@@ -470,9 +478,16 @@ class ViewerRequestHandler(BaseHTTPRequestHandler):
         self._send_json(resolver.build_icon_meta(ctx.game.engine))
 
 
-def make_server(app_state: AppState, host: str = "127.0.0.1", port: int = PORT) -> HTTPServer:
-    handler_cls = type("BoundViewerRequestHandler", (ViewerRequestHandler,), {"app_state": app_state})
-    return HTTPServer((host, port), handler_cls)
+class ViewerHTTPServer(ThreadingHTTPServer):
+    """每个服务器实例持有自己的 AppState，处理线程通过 self.server 取用。"""
+
+    def __init__(self, server_address, app_state: AppState):
+        super().__init__(server_address, ViewerRequestHandler)
+        self.app_state = app_state
+
+
+def make_server(app_state: AppState, host: str = "127.0.0.1", port: int = PORT) -> ViewerHTTPServer:
+    return ViewerHTTPServer((host, port), app_state)
 
 
 def run_server(app_state: AppState, host: str = "127.0.0.1", port: int = PORT, open_browser: bool = True) -> None:
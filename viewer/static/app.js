@@ -19,11 +19,16 @@ let mapLoadToken = 0;
 const spriteImageCache = new Map();
 const characterAnimTimers = new WeakMap();
 const tilesetImageCache = new Map();
+const tipHtmlCache = new Map();
 let mapTileRender = {token: 0, status: 'idle', images: {}};
 let mapEventSpriteRender = {token: 0, status: 'idle', sprites: []};
 let floatingWindowSeq = 0;
 let floatingWindowZ = 5600;
 let floatingWindowDrag = null;
+let pageTabNodes = [];
+let detailRenderToken = 0;
+let pendingDetailChunks = null; // 分帧追加中尚未写入的条目 {token, head, rows, pos}
+let pageContentNodes = [];
 
 const canvas = document.getElementById('mapCanvas');
 const ctx = canvas.getContext('2d');
@@ -132,17 +137,53 @@ async function apiText(url, options) {
 
 function pushDetail(html) {
   const dc = document.getElementById('detailContent');
+  // 历史记录要保存完整内容：分帧追加还没写完的条目先同步补齐
+  flushDetailChunks();
   if (dc.innerHTML && !dc.innerHTML.includes('empty-state') && !dc.innerHTML.includes('请稍候')) {
     detailHistory.push(dc.innerHTML);
     if (detailHistory.length > 50) detailHistory.shift();
   }
   dc.innerHTML = html;
+  detailRenderToken++;
+  pageTabNodes = [];
+  pageContentNodes = [];
   document.getElementById('backBtn').style.display = detailHistory.length ? 'inline-block' : 'none';
 }
+function detailChunksLive(pending) {
+  // 详情区被 pushDetail/goBack 或直接改写 innerHTML 替换后，剩余条目作废
+  const dc = document.getElementById('detailContent');
+  return pending === pendingDetailChunks && pending.token === detailRenderToken && dc.firstElementChild === pending.head;
+}
+function flushDetailChunks() {
+  const pending = pendingDetailChunks;
+  if (pending && detailChunksLive(pending)) {
+    document.getElementById('detailContent').insertAdjacentHTML('beforeend', pending.rows.slice(pending.pos).join(''));
+  }
+  pendingDetailChunks = null;
+}
+function appendDetailChunks(rows, chunkSize) {
+  // 大量同级条目分帧追加，避免一次性解析整段 HTML
+  const dc = document.getElementById('detailContent');
+  const pending = {token: detailRenderToken, head: dc.firstElementChild, rows, pos: 0};
+  pendingDetailChunks = pending;
+  function step() {
+    if (!detailChunksLive(pending)) return;
+    dc.insertAdjacentHTML('beforeend', rows.slice(pending.pos, pending.pos + chunkSize).join(''));
+    pending.pos += chunkSize;
+    if (pending.pos < rows.length) requestAnimationFrame(step);
+    else pendingDetailChunks = null;
+  }
+  if (rows.length) step();
+  else pendingDetailChunks = null;
+}
+
 function goBack() {
   if (!detailHistory.length) return;
   const dc = document.getElementById('detailContent');
   dc.innerHTML = detailHistory.pop();
+  detailRenderToken++;
+  pageTabNodes = [];
+  pageContentNodes = [];
   document.getElementById('backBtn').style.display = detailHistory.length ? 'inline-block' : 'none';
 }
 
@@ -175,12 +216,14 @@ function invalidateEncyclopediaCache() {
   encData = null;
   encCacheKey = '';
   encSelIdx = -1;
+  tipHtmlCache.clear();
 }
 
 function invalidateAssetMetaCache() {
   assetMeta = null;
   assetMetaKey = '';
   iconSheetReady = false;
+  tipHtmlCache.clear();
 }
 
 function getAssetMetaKey(game) {
@@ -200,11 +243,13 @@ async function ensureAssetMeta(force) {
   assetMeta = await apiJson('/api/assets/meta');
   assetMetaKey = key;
   iconSheetReady = false;
+  tipHtmlCache.clear();
 
   if (assetMeta && assetMeta.iconset_url) {
     const img = new Image();
     img.onload = function() {
       iconSheetReady = true;
+      tipHtmlCache.clear();
       if (encData) {
         renderEncList();
         if (encSelIdx >= 0) showEncDetail(encSelIdx);
@@ -1579,6 +1624,11 @@ async function ensureEncData(forceReload) {
   if (!forceReload && encData && encCacheKey === key) return;
   encData = await apiJson('/api/encyclopedia');
   encCacheKey = key;
+  tipHtmlCache.clear();
+  for (const arr of Object.values(encData || {})) {
+    if (!Array.isArray(arr)) continue;
+    for (const it of arr) it._lname = String(it.name || '').toLowerCase();
+  }
 }
 
 function findEncItem(kind, id) {
@@ -1744,8 +1794,18 @@ function buildEnemyTipHtml(enemy) {
   return h;
 }
 
+function cachedTipHtml(key, build) {
+  let html = tipHtmlCache.get(key);
+  if (html === undefined) {
+    html = build();
+    tipHtmlCache.set(key, html);
+  }
+  return html;
+}
+
 function showItemTooltip(kind, item) {
-  openFloatingWindow('条目详情', buildItemTipHtml(kind, item));
+  const key = kind + '/' + (item ? item.id : 0);
+  openFloatingWindow('条目详情', cachedTipHtml(key, () => buildItemTipHtml(kind, item)));
 }
 
 function showTroopTooltip(ref) {
@@ -1757,7 +1817,8 @@ function showEncounterTooltip(ref) {
 }
 
 function showEnemyTooltip(enemy) {
-  openFloatingWindow('怪物详情', buildEnemyTipHtml(enemy));
+  const key = 'enemies/' + (enemy ? enemy.id : 0);
+  openFloatingWindow('怪物详情', cachedTipHtml(key, () => buildEnemyTipHtml(enemy)));
 }
 
 function buildSkillTipHtml(skill) {
@@ -1895,17 +1956,27 @@ function showEventDetail(evt) {
   });
 
   pushDetail(html);
-  const firstPage = document.querySelector('.page-content[data-page="0"]');
+  cachePageNodes();
+  const firstPage = pageContentNodes[0];
   if (firstPage) hydratePageVisuals(firstPage);
 }
 
+function cachePageNodes() {
+  const dc = document.getElementById('detailContent');
+  pageTabNodes = Array.from(dc.querySelectorAll('.page-tab'));
+  pageContentNodes = Array.from(dc.querySelectorAll('.page-content'));
+}
+
 function switchPage(el, idx) {
-  el.parentElement.querySelectorAll('.page-tab').forEach(t => t.classList.remove('active'));
+  // 返回历史页面后节点已重建，缓存失效时重新收集
+  if (!pageTabNodes.includes(el)) cachePageNodes();
+  pageTabNodes.forEach(t => t.classList.remove('active'));
   el.classList.add('active');
   let activePage = null;
-  document.querySelectorAll('.page-content').forEach(p => {
-    p.style.display = p.dataset.page == idx ? '' : 'none';
-    if (p.dataset.page == idx) activePage = p;
+  pageContentNodes.forEach(p => {
+    const active = p.dataset.page == idx;
+    p.style.display = active ? '' : 'none';
+    if (active) activePage = p;
   });
   if (activePage) hydratePageVisuals(activePage);
 }
@@ -2132,9 +2203,7 @@ function renderPage(pg) {
     pg.commands.forEach(cmd => {
       const pad = cmd.indent * 16;
       if (cmd.cls === 'cmd-common-event') {
-        const m = cmd.text.match(/#(\d+)/);
-        const ceId = m ? m[1] : '0';
-        h += '<div class="cmd-line ' + cmd.cls + '" style="padding-left:' + pad + 'px" onclick="loadCommonEvent(' + ceId + ')">';
+        h += '<div class="cmd-line ' + cmd.cls + '" data-ce-id="' + Number(cmd.ceId || 0) + '" style="padding-left:' + pad + 'px">';
       } else {
         h += '<div class="cmd-line ' + (cmd.cls||'') + '" style="padding-left:' + pad + 'px">';
       }
@@ -2170,9 +2239,7 @@ async function loadCommonEvent(ceId) {
     ce.commands.forEach(function(cmd) {
       const pad = cmd.indent * 16;
       if (cmd.cls === 'cmd-common-event') {
-        const m = cmd.text.match(/#(\d+)/);
-        const cid = m ? m[1] : '0';
-        html += '<div class="cmd-line ' + cmd.cls + '" style="padding-left:' + pad + 'px" onclick="loadCommonEvent(' + cid + ')">';
+        html += '<div class="cmd-line ' + cmd.cls + '" data-ce-id="' + Number(cmd.ceId || 0) + '" style="padding-left:' + pad + 'px">';
       } else {
         html += '<div class="cmd-line ' + (cmd.cls||'') + '" style="padding-left:' + pad + 'px">';
       }
@@ -2183,6 +2250,11 @@ async function loadCommonEvent(ceId) {
   pushDetail(html);
 }
 
+document.getElementById('detailContent').addEventListener('click', e => {
+  const line = e.target.closest('.cmd-common-event');
+  if (line) loadCommonEvent(Number(line.dataset.ceId || 0));
+});
+
 // ===== 全局搜索 =====
 const gsInput = document.getElementById('globalSearchInput');
 const gsBtn = document.getElementById('globalSearchBtn');
@@ -2245,11 +2317,10 @@ function renderSearchResults(data, kw) {
   }
   const TC = {treasure:'#ffd43b',transfer:'#74b9ff',battle:'#ff6b6b',dialog:'#51cf66',other:'#636e72'};
   const TL = {treasure:'宝箱',transfer:'传送',battle:'战斗',dialog:'对话',other:'其他'};
-  let html = '<div class="info-block"><h3>搜索结果: "' + esc(kw) + '" (' + data.length + ' 条)</h3></div>';
-  data.forEach((r, i) => {
+  const rows = data.map((r, i) => {
     const tc = TC[r.type] || TC.other;
     const tl = TL[r.type] || '其他';
-    html += '<div class="search-result" onclick="gotoResult('+i+')">';
+    let html = '<div class="search-result" onclick="gotoResult('+i+')">';
     html += '<div class="sr-header">';
     html += '<span class="dot" style="background:'+tc+'"></span>';
     html += '<span class="sr-map">' + esc(r.mapName) + '</span>';
@@ -2259,8 +2330,10 @@ function renderSearchResults(data, kw) {
     html += '<div class="sr-match">';
     r.matches.forEach(m => { html += esc(m) + '<br>'; });
     html += '</div></div>';
+    return html;
   });
-  pushDetail(html);
+  pushDetail('<div class="info-block"><h3>搜索结果: "' + esc(kw) + '" (' + data.length + ' 条)</h3></div>');
+  appendDetailChunks(rows, 50);
   window._searchResults = data;
 }
 
@@ -2330,7 +2403,7 @@ function renderEncList() {
   if (!encData) return;
   const list = encData[encTab] || [];
   const q = document.getElementById('encSearch').value.toLowerCase();
-  const filtered = q ? list.filter(x => x.name.toLowerCase().includes(q)) : list;
+  const filtered = q ? list.filter(x => x._lname.includes(q)) : list;
   const el = document.getElementById('encList');
   let html = '';
   filtered.forEach((item, i) => {
@@ -2358,127 +2431,135 @@ function renderEncList() {
   el.innerHTML = html || '<div style="padding:20px;color:var(--muted)">无结果</div>';
 }
 
+function statRow(key, val) {
+  return '<div class="stat"><span>' + key + '</span><span class="val">' + val + '</span></div>';
+}
+
+function statRowC(key, val, color) {
+  return '<div class="stat"><span>' + key + '</span><span class="val" style="color:' + color + '">' + val + '</span></div>';
+}
+
 function showEncDetail(idx) {
   encSelIdx = idx;
   renderEncList();
   const item = (encData[encTab] || [])[idx];
   if (!item) return;
   const el = document.getElementById('encDetail');
-  let h = `<div class="enc-detail"><h3>${iconHtml(item.iconIndex)} #${item.id} ${esc(item.name)}</h3>`;
+  const parts = ['<div class="enc-detail"><h3>' + iconHtml(item.iconIndex) + ' #' + item.id + ' ' + esc(item.name) + '</h3>'];
 
   // 描述
-  if (item.desc) h += `<div class="desc">${esc(item.desc)}</div>`;
+  if (item.desc) parts.push('<div class="desc">' + esc(item.desc) + '</div>');
   if (encTab === 'enemies') {
     if (item.portraitRel) {
-      h += `<img class="item-tip-portrait" src="/api/assets/file?rel=${encodeURIComponent(item.portraitRel)}" alt="${escAttr(item.name)}">`;
+      parts.push('<img class="item-tip-portrait" src="/api/assets/file?rel=' + encodeURIComponent(item.portraitRel) + '" alt="' + escAttr(item.name) + '">');
     } else {
-      h += `<div class="item-tip-portrait-empty">未找到怪物大图</div>`;
+      parts.push('<div class="item-tip-portrait-empty">未找到怪物大图</div>');
     }
   }
 
   // 类型/价格行
   if (encTab === 'weapons') {
-    h += `<div class="stat"><span>类型</span><span class="val">${esc(item.wtype)}</span></div>`;
+    parts.push(statRow('类型', esc(item.wtype)));
   } else if (encTab === 'armors') {
-    h += `<div class="stat"><span>防具类型</span><span class="val">${esc(item.atype)}</span></div>`;
-    h += `<div class="stat"><span>装备位置</span><span class="val">${esc(item.etype)}</span></div>`;
+    parts.push(statRow('防具类型', esc(item.atype)));
+    parts.push(statRow('装备位置', esc(item.etype)));
   } else if (encTab === 'items') {
-    h += `<div class="stat"><span>分类</span><span class="val">${esc(item.itype)}</span></div>`;
-    h += `<div class="stat"><span>范围</span><span class="val">${esc(item.scope)}</span></div>`;
-    h += `<div class="stat"><span>消耗</span><span class="val">${item.consumable ? '是' : '否'}</span></div>`;
+    parts.push(statRow('分类', esc(item.itype)));
+    parts.push(statRow('范围', esc(item.scope)));
+    parts.push(statRow('消耗', item.consumable ? '是' : '否'));
   } else if (encTab === 'skills') {
-    h += `<div class="stat"><span>技能类型</span><span class="val">${esc(item.stype || '?')}</span></div>`;
-    h += `<div class="stat"><span>作用范围</span><span class="val">${esc(item.scope || '?')}</span></div>`;
-    h += `<div class="stat"><span>可用场景</span><span class="val">${esc(item.occasion || '?')}</span></div>`;
-    h += `<div class="stat"><span>命中类型</span><span class="val">${esc(item.hitType || '?')}</span></div>`;
-    h += `<div class="stat"><span>MP消耗</span><span class="val">${Number(item.mpCost || 0)}</span></div>`;
-    h += `<div class="stat"><span>TP消耗</span><span class="val">${Number(item.tpCost || 0)}</span></div>`;
-    h += `<div class="stat"><span>成功率</span><span class="val">${Number(item.successRate || 0)}%</span></div>`;
-    h += `<div class="stat"><span>重复次数</span><span class="val">${Number(item.repeats || 1)}</span></div>`;
-    h += `<div class="stat"><span>速度修正</span><span class="val">${Number(item.speed || 0)}</span></div>`;
-    h += `<div class="stat"><span>伤害类型</span><span class="val">${esc(item.damageType || '?')}</span></div>`;
-    h += `<div class="stat"><span>伤害属性</span><span class="val">${esc(item.damageElement || '?')}</span></div>`;
-    h += `<div class="stat"><span>波动</span><span class="val">${Number(item.damageVariance || 0)}%</span></div>`;
-    h += `<div class="stat"><span>可暴击</span><span class="val">${item.damageCritical ? '是' : '否'}</span></div>`;
+    parts.push(statRow('技能类型', esc(item.stype || '?')));
+    parts.push(statRow('作用范围', esc(item.scope || '?')));
+    parts.push(statRow('可用场景', esc(item.occasion || '?')));
+    parts.push(statRow('命中类型', esc(item.hitType || '?')));
+    parts.push(statRow('MP消耗', Number(item.mpCost || 0)));
+    parts.push(statRow('TP消耗', Number(item.tpCost || 0)));
+    parts.push(statRow('成功率', Number(item.successRate || 0) + '%'));
+    parts.push(statRow('重复次数', Number(item.repeats || 1)));
+    parts.push(statRow('速度修正', Number(item.speed || 0)));
+    parts.push(statRow('伤害类型', esc(item.damageType || '?')));
+    parts.push(statRow('伤害属性', esc(item.damageElement || '?')));
+    parts.push(statRow('波动', Number(item.damageVariance || 0) + '%'));
+    parts.push(statRow('可暴击', item.damageCritical ? '是' : '否'));
   } else if (encTab === 'enemies') {
-    h += `<div class="stat"><span>经验值</span><span class="val">${item.exp}</span></div>`;
-    h += `<div class="stat"><span>金币</span><span class="val">${item.gold}</span></div>`;
+    parts.push(statRow('经验值', item.exp));
+    parts.push(statRow('金币', item.gold));
   }
   if (item.price !== undefined && encTab !== 'enemies') {
-    h += `<div class="stat"><span>价格</span><span class="val">${item.price}G</span></div>`;
+    parts.push(statRow('价格', item.price + 'G'));
   }
 
   // 能力值
   if (item.params && item.params.length) {
-    h += `<div class="section"><div class="section-title">能力值</div>`;
+    parts.push('<div class="section"><div class="section-title">能力值</div>');
     item.params.forEach(p => {
       const color = p.value > 0 ? '#51cf66' : '#ff6b6b';
-      h += `<div class="stat"><span>${esc(p.name)}</span><span class="val" style="color:${color}">${p.value > 0 ? '+' : ''}${p.value}</span></div>`;
+      parts.push(statRowC(esc(p.name), (p.value > 0 ? '+' : '') + p.value, color));
     });
-    h += `</div>`;
+    parts.push('</div>');
   }
 
   // 特性
   if (item.traits && item.traits.length) {
-    h += `<div class="section"><div class="section-title">特性</div>`;
-    item.traits.forEach(t => { h += `<div class="trait">· ${esc(t)}</div>`; });
-    h += `</div>`;
+    parts.push('<div class="section"><div class="section-title">特性</div>');
+    item.traits.forEach(t => { parts.push('<div class="trait">· ' + esc(t) + '</div>'); });
+    parts.push('</div>');
   }
 
   // 物品效果
   if (item.effects && item.effects.length) {
-    h += `<div class="section"><div class="section-title">使用效果</div>`;
-    item.effects.forEach(e => { h += `<div class="trait">· ${esc(e)}</div>`; });
-    h += `</div>`;
+    parts.push('<div class="section"><div class="section-title">使用效果</div>');
+    item.effects.forEach(e => { parts.push('<div class="trait">· ' + esc(e) + '</div>'); });
+    parts.push('</div>');
   }
 
   // 技能公式与机制说明
   if (encTab === 'skills') {
     if (item.formula) {
-      h += `<div class="section"><div class="section-title">计算公式</div>`;
-      h += `<div class="formula-raw">${esc(item.formula)}</div>`;
+      parts.push('<div class="section"><div class="section-title">计算公式</div>');
+      parts.push('<div class="formula-raw">' + esc(item.formula) + '</div>');
       if (item.formulaPretty) {
-        h += `<div class="formula-pretty">${esc(item.formulaPretty)}</div>`;
+        parts.push('<div class="formula-pretty">' + esc(item.formulaPretty) + '</div>');
       }
-      h += `</div>`;
+      parts.push('</div>');
     } else if (item.legacyDamage) {
       const ld = item.legacyDamage;
-      h += `<div class="section"><div class="section-title">机制（VX旧版）</div>`;
-      h += `<div class="trait">· 基础伤害: ${Number(ld.baseDamage || 0)}</div>`;
-      h += `<div class="trait">· 攻击力系数: ${Number(ld.atkF || 0)}%</div>`;
-      h += `<div class="trait">· 魔法力系数: ${Number(ld.spiF || 0)}%</div>`;
-      h += `<div class="trait">· 波动范围: ${Number(ld.variance || 0)}%</div>`;
-      h += `</div>`;
+      parts.push('<div class="section"><div class="section-title">机制（VX旧版）</div>');
+      parts.push('<div class="trait">· 基础伤害: ' + Number(ld.baseDamage || 0) + '</div>');
+      parts.push('<div class="trait">· 攻击力系数: ' + Number(ld.atkF || 0) + '%</div>');
+      parts.push('<div class="trait">· 魔法力系数: ' + Number(ld.spiF || 0) + '%</div>');
+      parts.push('<div class="trait">· 波动范围: ' + Number(ld.variance || 0) + '%</div>');
+      parts.push('</div>');
     }
     if (item.formulaTips && item.formulaTips.length) {
-      h += `<div class="section"><div class="section-title">说明</div>`;
-      item.formulaTips.forEach(t => { h += `<div class="trait">· ${esc(t)}</div>`; });
-      h += `</div>`;
+      parts.push('<div class="section"><div class="section-title">说明</div>');
+      item.formulaTips.forEach(t => { parts.push('<div class="trait">· ' + esc(t) + '</div>'); });
+      parts.push('</div>');
     }
   }
 
   // 怪物掉落
   if (item.drops && item.drops.length) {
-    h += `<div class="section"><div class="section-title">掉落物</div>`;
-    item.drops.forEach(d => { h += `<div class="trait">· ${esc(d)}</div>`; });
-    h += `</div>`;
+    parts.push('<div class="section"><div class="section-title">掉落物</div>');
+    item.drops.forEach(d => { parts.push('<div class="trait">· ' + esc(d) + '</div>'); });
+    parts.push('</div>');
   }
 
   // 怪物行动
   if (item.actions && item.actions.length) {
-    h += `<div class="section"><div class="section-title">行动模式</div>`;
+    parts.push('<div class="section"><div class="section-title">行动模式</div>');
     item.actions.forEach(a => {
       const sid = Number(a.skillId || 0);
       const skillName = sid > 0
-        ? `<span class="ref-link" data-kind="skills" data-id="${sid}">${esc(a.skill)}</span>`
+        ? '<span class="ref-link" data-kind="skills" data-id="' + sid + '">' + esc(a.skill) + '</span>'
         : esc(a.skill);
-      h += `<div class="trait">· ${skillName} (优先度:${a.rating})</div>`;
+      parts.push('<div class="trait">· ' + skillName + ' (优先度:' + a.rating + ')</div>');
     });
-    h += `</div>`;
+    parts.push('</div>');
   }
 
-  h += `</div>`;
-  el.innerHTML = h;
+  parts.push('</div>');
+  el.innerHTML = parts.join('');
 }
 
 async function refreshEncyclopediaNow() {